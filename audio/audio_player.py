@@ -0,0 +1,22 @@
+from audio.sound_bank import SoundBank
+from model.game_event import GameEvent
+
+
+class AudioPlayer:
+    # Plays sound effects for the events of a GameEngine
+
+    def __init__(self, sound_bank: SoundBank):
+        self.sfx = sound_bank
+
+    def on_event(self, event: GameEvent, tile):
+        if event == GameEvent.DOT_EATEN:
+            self.sfx.play_munch()
+        elif event == GameEvent.POWER_PELLET_EATEN:
+            self.sfx.play('power_pellet')
+        elif event == GameEvent.GHOST_EATEN:
+            self.sfx.play('eat_ghost', then='retreating')
+        elif event == GameEvent.PLAYER_DYING:
+            self.sfx.play('pacman_death')
+
+    def play_game_start(self):
+        self.sfx.play('game_start')
@@ -0,0 +1,145 @@
+import os
+from pathlib import Path
+
+import pygame
+
+from settings import SOUND_CHANNELS, SOUND_PCM_CACHE
+
+
+class SoundDefinition:
+    def __init__(self, path: str, priority: int, max_voices: int):
+        self.path = Path(path)
+        # a sound can take over channels of sounds with lower or equal priority
+        self.priority = priority
+        # how many copies of the sound can be heard at the same time
+        self.max_voices = max_voices
+
+
+SOUNDS = {
+    'game_start': SoundDefinition('media/game_start.wav', priority=3, max_voices=1),
+    'pacman_death': SoundDefinition('media/pacman_death.wav', priority=3, max_voices=1),
+    'eat_ghost': SoundDefinition('media/eat_ghost.wav', priority=2, max_voices=2),
+    'power_pellet': SoundDefinition('media/power_pellet.wav', priority=2, max_voices=1),
+    'retreating': SoundDefinition('media/retreating.wav', priority=1, max_voices=2),
+    'munch_1': SoundDefinition('media/munch_1.wav', priority=0, max_voices=1),
+    'munch_2': SoundDefinition('media/munch_2.wav', priority=0, max_voices=1),
+}
+
+
+class SoundBank:
+    # Sounds are decoded on first use and shared by the whole process
+    __shared = None
+
+    def __init__(self, definitions: dict, channels=SOUND_CHANNELS, pcm_cache=SOUND_PCM_CACHE):
+        self.definitions = definitions
+        self.channel_count = channels
+        self.pcm_cache = Path(pcm_cache) if pcm_cache else None
+        self.sounds = {}
+        self.channels = []
+        # channel index -> (sound name, priority, play order)
+        self.voices = {}
+        # channel index -> name of the sound queued after its voice
+        self.queued = {}
+        self.play_counter = 0
+        self.munch_i = False
+
+    @classmethod
+    def shared(cls):
+        if cls.__shared is None:
+            cls.__shared = cls(SOUNDS)
+        return cls.__shared
+
+    def is_enabled(self):
+        return pygame.mixer.get_init() is not None
+
+    def preload(self):
+        # Decodes every sound now rather than on first use
+        if self.is_enabled():
+            for name in self.definitions:
+                self.get(name)
+
+    def get(self, name):
+        if name not in self.sounds:
+            self.sounds[name] = self.__load(name, self.definitions[name])
+        return self.sounds[name]
+
+    def play(self, name, then=None):
+        # then is queued on the same channel, the mixer starts it as soon as name ends
+        if not self.is_enabled():
+            return None
+        definition = self.definitions[name]
+        channel_index = self.__find_channel(name, definition)
+        if channel_index is None:
+            return None
+        channel = self.channels[channel_index]
+        # playing also drops what was queued on the channel
+        channel.play(self.get(name))
+        self.queued.pop(channel_index, None)
+        if then is not None:
+            channel.queue(self.get(then))
+            self.queued[channel_index] = then
+        self.__set_voice(channel_index, name)
+        return channel
+
+    def __set_voice(self, channel_index, name):
+        self.play_counter += 1
+        self.voices[channel_index] = (name, self.definitions[name].priority, self.play_counter)
+
+    def play_munch(self):
+        if self.munch_i:
+            self.play('munch_2')
+            self.munch_i = False
+        else:
+            self.play('munch_1')
+            self.munch_i = True
+
+    def __find_channel(self, name, definition: SoundDefinition):
+        if not self.channels:
+            pygame.mixer.set_num_channels(self.channel_count)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.channel_count)]
+        self.__update_voices()
+
+        same_sound = [index for index, voice in self.voices.items() if voice[0] == name]
+        if len(same_sound) >= definition.max_voices:
+            # restart the oldest copy of the sound instead of stacking a new one
+            return min(same_sound, key=lambda index: self.voices[index][2])
+
+        for channel_index in range(self.channel_count):
+            if channel_index not in self.voices:
+                return channel_index
+
+        # all channels are busy: take the oldest of the least important voices, if not more important than us
+        channel_index = min(self.voices, key=lambda index: (self.voices[index][1], self.voices[index][2]))
+        if self.voices[channel_index][1] <= definition.priority:
+            return channel_index
+        return None
+
+    def __update_voices(self):
+        for channel_index in list(self.voices):
+            channel = self.channels[channel_index]
+            if not channel.get_busy():
+                del self.voices[channel_index]
+                self.queued.pop(channel_index, None)
+            elif channel_index in self.queued and channel.get_queue() is None:
+                # the mixer started the queued sound, it is the voice of the channel from now on
+                name = self.queued.pop(channel_index)
+                self.__set_voice(channel_index, name)
+                same_sound = [index for index, voice in self.voices.items() if voice[0] == name]
+                if len(same_sound) > self.definitions[name].max_voices:
+                    oldest = min(same_sound, key=lambda index: self.voices[index][2])
+                    self.channels[oldest].stop()
+                    del self.voices[oldest]
+
+    def __load(self, name, definition: SoundDefinition):
+        if self.pcm_cache is None:
+            return pygame.mixer.Sound(str(definition.path))
+
+        frequency, size, channels = pygame.mixer.get_init()
+        cache_file = self.pcm_cache.joinpath(f'{name}-{frequency}-{size}-{channels}.pcm')
+        if cache_file.exists() and os.path.getmtime(cache_file) >= os.path.getmtime(definition.path):
+            return pygame.mixer.Sound(buffer=cache_file.read_bytes())
+
+        sound = pygame.mixer.Sound(str(definition.path))
+        self.pcm_cache.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(sound.get_raw())
+        return sound
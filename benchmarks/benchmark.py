@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+import os
+
+# benchmarks run without a window or a sound card
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from draw.game_renderer import GameRenderer
+from levels.default_level import create_default_level
+from levels.level_content_initializer import LevelContentInitializer
+from levels.level_loader import create_level, parse_level
+from settings import BACKGROUND_COLOR, DEFAULT_LEVEL, RESOLUTION
+from simulation.headless import create_headless_engine
+from simulation.policies import RandomTurnsPolicy
+
+BENCHMARK_RESULTS = 'benchmark_results.json'
+BENCHMARK_BASELINE = 'benchmarks/baseline.json'
+# allowed relative slowdown of a metric before the comparison fails
+BENCHMARK_THRESHOLD = 0.10
+# metrics too noisy for the default threshold
+BENCHMARK_THRESHOLDS = {
+    'game_construction_ms': 0.25,
+    'restart_ms': 0.25,
+}
+
+SIMULATION_TICKS = 5000
+RENDER_FRAMES = 300
+# the default maze repeated this many times down and across, drawn through a scrolling view
+LARGE_MAZE_REPEATS = (6, 7)
+LARGE_MAZE_TILE_SIZE = (30, 28)
+STARTUP_REPEATS = 5
+
+
+class Benchmark:
+    # Measures the game and collects metrics as name -> {value, unit, better}
+
+    def __init__(self, repeats=3):
+        self.repeats = repeats
+        self.metrics = {}
+
+    def run(self):
+        self.measure_simulation()
+        self.measure_rendering()
+        self.measure_large_maze_rendering()
+        self.measure_startup()
+        return self.metrics
+
+    def add(self, name, value, unit, better):
+        self.metrics[name] = {'value': value, 'unit': unit, 'better': better}
+
+    def measure_simulation(self):
+        # Game logic ticks per second, best of the repeats since slower runs are disturbed by something else
+        best = 0
+        for repeat in range(self.repeats):
+            engine = create_headless_engine()
+            policy = RandomTurnsPolicy(repeat)
+            ticks = 0
+            start = time.perf_counter()
+            while ticks < SIMULATION_TICKS:
+                if engine.game_over:
+                    engine = create_headless_engine()
+                engine.step(policy(engine, ticks))
+                ticks += 1
+            best = max(best, ticks / (time.perf_counter() - start))
+        self.add('simulation_ticks_per_second', best, 'ticks/s', 'higher')
+
+    def measure_rendering(self):
+        # Median cost of each drawing phase of GameRenderer.render while the game is played
+        import pacman
+
+        game = pacman.Game()
+        renderer = game.renderer
+        phases = {
+            'render_level_ms': renderer.render_level,
+            'draw_misc_ms': renderer.draw_misc,
+            'render_ghosts_ms': renderer.render_ghosts,
+            'render_player_ms': renderer.render_player,
+            'render_frame_ms': renderer.render,
+        }
+        samples = {name: [] for name in phases}
+        policy = RandomTurnsPolicy(0)
+        for frame in range(RENDER_FRAMES):
+            game.game_engine.step(policy(game.game_engine, frame))
+            game.draw()
+            for name, phase in phases.items():
+                start = time.perf_counter()
+                phase()
+                samples[name].append((time.perf_counter() - start) * 1000)
+            renderer.collect_dirty_rects()
+        for name, values in samples.items():
+            self.add(name, statistics.median(values), 'ms', 'lower')
+
+    def measure_large_maze_rendering(self):
+        # A frame should cost the same as with the default level, only the part of the maze in view is drawn
+        values = parse_level(Path(DEFAULT_LEVEL).read_text(), DEFAULT_LEVEL)
+        values['board'] = np.tile(values['board'], LARGE_MAZE_REPEATS)
+        pygame.init()
+        screen = pygame.display.set_mode(RESOLUTION)
+        engine = LevelContentInitializer(create_level(values), screen, tile_size=LARGE_MAZE_TILE_SIZE) \
+            .init_game_engine()
+        renderer = GameRenderer(screen, engine)
+        policy = RandomTurnsPolicy(0)
+        samples = []
+        for frame in range(RENDER_FRAMES):
+            engine.step(policy(engine, frame))
+            screen.fill(BACKGROUND_COLOR)
+            start = time.perf_counter()
+            renderer.render()
+            samples.append((time.perf_counter() - start) * 1000)
+            renderer.collect_dirty_rects()
+        self.add('render_frame_large_maze_ms', statistics.median(samples), 'ms', 'lower')
+
+    def measure_startup(self):
+        import pacman
+
+        pygame.init()
+        screen = pygame.display.set_mode(RESOLUTION)
+        self.add('asset_loading_ms',
+                 self.__median_time(lambda: LevelContentInitializer(create_default_level(), screen)), 'ms', 'lower')
+        self.add('game_construction_ms', self.__median_time(pacman.Game), 'ms', 'lower')
+        game = pacman.Game()
+        # what happens when space is hit on the game over screen
+        self.add('restart_ms', self.__median_time(game.restart), 'ms', 'lower')
+
+    @staticmethod
+    def __median_time(function):
+        durations = []
+        for _ in range(STARTUP_REPEATS):
+            start = time.perf_counter()
+            function()
+            durations.append((time.perf_counter() - start) * 1000)
+        return statistics.median(durations)
+
+
+def save_results(metrics: dict, path):
+    report = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'machine': platform.machine(),
+        'metrics': metrics,
+    }
+    with open(path, 'w') as results_file:
+        json.dump(report, results_file, indent=2)
+
+
+def load_metrics(path):
+    with open(path) as results_file:
+        return json.load(results_file)['metrics']
+
+
+def compare(metrics: dict, baseline: dict, threshold=BENCHMARK_THRESHOLD, thresholds=None):
+    # Returns (name, baseline value, value, relative slowdown, allowed slowdown) of each metric of both runs
+    thresholds = dict(BENCHMARK_THRESHOLDS, **(thresholds or {}))
+    rows = []
+    for name, metric in metrics.items():
+        if name not in baseline:
+            continue
+        old, new = baseline[name]['value'], metric['value']
+        if old == 0:
+            continue
+        slowdown = (old - new) / old if metric['better'] == 'higher' else (new - old) / old
+        rows.append((name, old, new, slowdown, thresholds.get(name, threshold)))
+    return rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure simulation, rendering and startup of the game')
+    parser.add_argument('--output', default=BENCHMARK_RESULTS, help='file the results are written to')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--compare', nargs='?', const=BENCHMARK_BASELINE, default=None, metavar='BASELINE',
+                        help=f'fail when a metric regressed against a baseline ({BENCHMARK_BASELINE} by default)')
+    parser.add_argument('--threshold', type=float, default=BENCHMARK_THRESHOLD,
+                        help='allowed relative regression of metrics without their own threshold')
+    parser.add_argument('--save-baseline', action='store_true', help=f'also store the results as {BENCHMARK_BASELINE}')
+    args = parser.parse_args()
+
+    results = Benchmark(args.repeats).run()
+    save_results(results, args.output)
+    if args.save_baseline:
+        save_results(results, BENCHMARK_BASELINE)
+    for metric_name, result in results.items():
+        print(f'{metric_name:<30}{result["value"]:12.3f} {result["unit"]}')
+
+    if args.compare is not None:
+        regressions = 0
+        print(f'\ncompared to {args.compare}:')
+        for metric_name, base, value, change, allowed in compare(results, load_metrics(args.compare), args.threshold):
+            failed = change > allowed
+            regressions += failed
+            print(f'{metric_name:<30}{base:12.3f} -> {value:12.3f} {-change:+8.1%} {"REGRESSION" if failed else "ok"}')
+        sys.exit(1 if regressions else 0)
@@ -1,262 +1,273 @@
-import pygame
-from pygame import Surface
-from model.board_structure import BoardStructure
+import enum
+
+import numpy as np
+
+from model.collision.collision_grid import CollisionGrid
 from model.direction import Direction
 from model.eaten_object import EatenObject
-from model.entity.ghost.blinky import Blinky
-from model.entity.ghost.clyde import Clyde
 from model.entity.ghost.ghost import Ghost
-from model.entity.ghost.inky import Inky
-from model.entity.ghost.pinky import Pinky
+from model.entity.ghost.targeting import GhostTargeting, TargetingSnapshot
+from model.game_event import GameEvent
 from model.level_config import LevelConfig
-import math
+from model.scheduling.tick_scheduler import TickScheduler
+from profiling.frame_profiler import FrameProfiler
 
 from model.entity.player.player import Player
 from settings import *
 
-PI = math.pi
-
-FLICK_FREQUENCY = 20
-SCORE_SCREEN_OFFSET = 50
+# attribute types saved by GameEngine.save_state, everything else is wiring, sprites or caches
+STATE_TYPES = (int, float, bool, str, tuple, enum.Enum)
 
-GHOST_EATEN_EVENT = pygame.USEREVENT + 1
 
 class GameEngine:
+    # Pure game simulation: it never touches the display, the mixer or the wall clock.
+    # Rendering and audio observe it through add_observer().
 
-    def __init__(self, screen: Surface, level: LevelConfig, player: Player, ghosts: list[Ghost]):
-        self.screen = screen
+    def __init__(self, level: LevelConfig, player: Player, ghosts: list[Ghost], tile_width, tile_height):
         self.level = level
         self.board_definition = level.board_definition
-        self.board = self.board_definition.board
+        self.pellets = self.board_definition.pellets
         self.board_width = self.board_definition.width
         self.board_height = self.board_definition.height
-        self.tile_height = ((screen.get_height() - SCORE_SCREEN_OFFSET) // self.board_height)
-        self.tile_width = (screen.get_width() // self.board_width)
-        self.flicker_counter = 0
-        self.flick = True
+        self.tile_height = tile_height
+        self.tile_width = tile_width
         self.player = player
         self.ghosts = ghosts
+        # the ghosts share their house
+        self.targeting = GhostTargeting([ghost.kind for ghost in ghosts], [ghost.home_corner for ghost in ghosts],
+                                        ghosts[0].ghost_house_location, ghosts[0].ghost_house_exit,
+                                        ghosts[0].ghost_house_bounds, tile_width, tile_height)
         self.direction_command = Direction.LEFT
-        self.game_font = pygame.font.SysFont('Comic Sans MS', 30)
-        self.score_coordinates = (SCORE_SCREEN_OFFSET, (self.screen.get_height() - SCORE_SCREEN_OFFSET))
-        self.powerup_circle_coordinates = (250, ((self.screen.get_height() - SCORE_SCREEN_OFFSET) + 15))
         self.pause = False
-        self.start_counter = 0
+        # the game stands still after pacman was caught, until the UNFREEZE timer
+        self.frozen = False
+        # chase or scatter, the mode of every ghost that is neither frightened nor eaten
+        self.ghost_mode = Ghost.State.CHASE
         self.game_over = False
+        self.observers = []
+        self.profiler = FrameProfiler()
+        # all timed transitions of the game, on the clock of the simulation
+        self.scheduler = TickScheduler()
+        self.scheduler.on(self.Timer.START, self.__start)
+        self.scheduler.on(self.Timer.UNFREEZE, self.__unfreeze)
+        self.scheduler.on(self.Timer.SCATTER, self.__scatter)
+        self.scheduler.on(self.Timer.CHASE, self.__chase)
+        self.scheduler.on(self.Timer.POWER_UP_ENDING, self.__power_up_ending)
+        self.scheduler.on(self.Timer.POWER_UP_OVER, self.__end_power_up)
+        # movements of the last tick, to find the ghosts pacman touched even between two frames
+        self.collision_grid = CollisionGrid(tile_width, tile_height)
+        for entity in [player] + ghosts:
+            self.collision_grid.add(entity, (entity.location_x, entity.location_y))
+        self.__get_ready()
+        # state of a new game, restored by reset()
+        self.initial_state = self.save_state()
 
-    def show_game_over(self):
-        self.screen.fill((0, 0, 0))
-        font = pygame.font.SysFont('arial', 40)
-        title = font.render('Game Over', True, 'red')
-        restart_button = font.render('Hit Space to restart', True, (255, 255, 255))
-        self.screen.blit(title, (
-            self.screen.get_width() / 2 - title.get_width() / 2, self.screen.get_height() / 2 - title.get_height() / 3))
-        self.screen.blit(restart_button, (self.screen.get_width() / 2 - restart_button.get_width() / 2,
-                                          self.screen.get_height() / 1.9 + restart_button.get_height()))
+    def add_observer(self, observer):
+        # observer must provide on_event(event: GameEvent, tile)
+        self.observers.append(observer)
 
-        self.screen.blit(self.ghosts[0].assets.right[0],
-                         (self.screen.get_width() / 2, self.screen.get_height() / 2 + self.screen.get_height() / 6))
-        self.screen.blit(self.ghosts[1].assets.right[0],
-                         (self.screen.get_width() / 2 - self.screen.get_width() / 8,
-                          self.screen.get_height() / 2 + self.screen.get_height() / 6))
-        self.screen.blit(self.ghosts[2].assets.right[0],
-                         (self.screen.get_width() / 2 - self.screen.get_width() / 16,
-                          self.screen.get_height() / 2 + self.screen.get_height() / 6))
-        self.screen.blit(self.ghosts[3].assets.right[0],
-                         (self.screen.get_width() / 2 + self.screen.get_width() / 16,
-                          self.screen.get_height() / 2 + self.screen.get_height() / 6))
+    def __notify(self, event: GameEvent, tile=None):
+        for observer in self.observers:
+            observer.on_event(event, tile)
 
-    def tick(self):
+    def reset(self):
+        # Starts a new game in place: the board, the entities, the score and the timers go back to how they were
+        # when the engine was created, the entities, their sprites and the observers are kept
+        self.load_state(self.initial_state)
+        self.__notify(GameEvent.GAME_RESET)
+
+    def step(self, direction_command: Direction = None):
+        # Advances the game by one tick, durations of the game are counted in ticks of 1 / TICK_RATE seconds
+        self.player.save_position()
+        for ghost in self.ghosts:
+            ghost.save_position()
+        if direction_command is not None:
+            self.direction_command = direction_command
+        if self.game_over or self.pause:
+            return
+        self.scheduler.advance()
         if self.player.lives == -1:
             self.game_over = True
-            self.show_game_over()
-        else:
-            self.render_level()
-            self.draw_misc()
-            self.render_ghosts()
-            if not self.pause:
-                if self.player.is_ready():
-                    self.reset_ghosts()
-                    self.render_ready_text()
-                    self.render_player()
-                    self.start_counter += 1
-                    if self.start_counter == START_TRIGGER:
-                        self.player.set_to_chase()
-                        self.start_counter = 0
-                elif self.player.is_chasing():
-                    self.render_player()
-                    self.move_player()
-                    self.move_ghosts()
-                    self.check_ghosts_and_player_collision()
-                elif self.player.is_eaten():
-                    self.player.play_death_animation(self.screen)
-            if DEBUG:
-                self.debug()
+            self.__notify(GameEvent.GAME_OVER)
+        elif self.frozen:
+            pass
+        elif self.player.is_chasing():
+            with self.profiler.phase('move_player'):
+                self.move_player()
+            with self.profiler.phase('move_ghosts'):
+                self.move_ghosts()
+            with self.profiler.phase('collision'):
+                self.check_ghosts_and_player_collision()
+            if self.pellets.remaining == 0 and self.player.is_chasing():
+                self.player.set_to_ready()
+                self.__get_ready()
+        elif self.player.is_eaten():
+            self.player.update_death_animation()
+            if self.player.is_ready():
+                self.__get_ready()
 
-    def check_ghosts_and_player_collision(self):
-        for ghost in self.ghosts:
-            if (abs(ghost.location_x - self.player.location_x) < DISTANCE_FACTOR) \
-                    and (abs(ghost.location_y - self.player.location_y) < DISTANCE_FACTOR):
-                if ghost.is_frightened():
-                    self.level.score += 50 * self.player.score_multiplier
-                    self.player.score_multiplier += 1
-                    ghost.set_to_eaten()
-                elif ghost.is_chasing() or ghost.is_scatter():
-                    pygame.time.wait(500)
-                    pygame.time.set_timer(PLAYER_EATEN_EVENT, 1, True)
-                    self.player.set_to_eaten()
+    def __get_ready(self):
+        # A new life or round: everyone back to the start, the ghost mode schedule begins again when pacman can move.
+        # Once every pellet was eaten the maze is filled again, score and lives are kept
+        if self.pellets.remaining == 0:
+            self.pellets.reset()
+            self.__notify(GameEvent.LEVEL_COMPLETE)
+        self.scheduler.cancel(self.Timer.SCATTER, self.Timer.CHASE, self.Timer.POWER_UP_ENDING,
+                              self.Timer.POWER_UP_OVER)
+        self.__end_power_up()
+        self.ghost_mode = Ghost.State.CHASE
+        self.reset_ghosts()
+        self.scheduler.schedule(START_TRIGGER, self.Timer.START)
 
-    def play_ghost_runsaway_sound(self):
-        self.player.sfx.retreating.play()
+    def __start(self):
+        self.player.set_to_chase()
+        self.scheduler.schedule(SCATTER_ENABLE_TRIGGER, self.Timer.SCATTER)
 
-    def play_player_eaten_sound(self):
-        self.player.sfx.pacman_death.play()
+    def __unfreeze(self):
+        self.frozen = False
+        self.__notify(GameEvent.PLAYER_DYING)
 
-    def render_player(self):
-        self.player.render(self.screen)
+    def __scatter(self):
+        self.__set_ghosts_mode(Ghost.State.SCATTER)
+        self.scheduler.schedule(SCATTER_DISABLE_TRIGGER, self.Timer.CHASE)
 
-    def move_player(self):
-        turned = self.player.move(self.screen, self.direction_command)
-        if not turned:
-            self.direction_command = self.player.direction
-        eaten = self.player.eat()
-        if eaten == EatenObject.DOT:
-            self.level.score += 10
-        elif eaten == EatenObject.BIG_DOT:
-            self.level.score += 50
-            self.player.powerup_counter = self.level.power_up_limit
-            self.__set_ghosts_state('frightened')
-        if not self.player.powerup:
-            self.__set_ghosts_state('chase')
+    def __chase(self):
+        self.__set_ghosts_mode(Ghost.State.CHASE)
+        self.scheduler.schedule(SCATTER_ENABLE_TRIGGER, self.Timer.SCATTER)
 
-    def render_ghosts(self):
+    def __start_power_up(self):
+        self.scheduler.cancel(self.Timer.POWER_UP_ENDING, self.Timer.POWER_UP_OVER)
+        self.player.powerup = True
+        self.player.powerup_ending = False
+        self.scheduler.schedule(self.level.power_up_limit - POWER_UP_BLINK, self.Timer.POWER_UP_ENDING)
+        self.scheduler.schedule(self.level.power_up_limit, self.Timer.POWER_UP_OVER)
         for ghost in self.ghosts:
-            ghost.render(self.screen)
+            ghost.set_to_frightened()
 
-    def move_ghosts(self):
-        for ghost in self.ghosts:
-            ghost.follow_target()
+    def __power_up_ending(self):
+        self.player.powerup_ending = True
 
-    def reset_ghosts(self):
+    def __end_power_up(self):
+        self.player.powerup = False
+        self.player.powerup_ending = False
+        self.player.score_multiplier = 1
+        # frightened ghosts go back to the mode of the others
         for ghost in self.ghosts:
-            ghost.reset_position()
+            if ghost.is_frightened():
+                self.__set_ghost_mode(ghost, self.ghost_mode)
 
-    def __set_ghosts_state(self, state: str):
+    def __set_ghosts_mode(self, mode: Ghost.State):
+        self.ghost_mode = mode
         for ghost in self.ghosts:
-            if state == 'frightened':
-                ghost.set_to_frightened()
-            elif state == 'eaten':
-                ghost.set_to_eaten()
-            elif state == 'scatter':
-                ghost.set_to_scatter()
-            elif state == 'chase':
-                ghost.set_to_chase()
+            if not ghost.is_frightened():
+                self.__set_ghost_mode(ghost, mode)
 
-    def __calculate_flick(self):
-        self.flicker_counter += 1
-        if self.flicker_counter % FLICK_FREQUENCY == 0:
-            self.flick = not self.flick
-        if self.flicker_counter == FLICK_FREQUENCY * 2:
-            self.flicker_counter = 0
+    @staticmethod
+    def __set_ghost_mode(ghost: Ghost, mode: Ghost.State):
+        if mode == Ghost.State.SCATTER:
+            ghost.set_to_scatter()
+        else:
+            ghost.set_to_chase()
 
-    def draw_misc(self):
-        score_text = self.game_font.render(f'Score: {self.level.score}', True, 'white')
-        self.screen.blit(score_text, self.score_coordinates)
+    def save_state(self) -> dict:
+        # Everything needed to go on with the game from the current tick
+        return {
+            'engine': self.__get_state_values(self),
+            'score': self.level.score,
+            'pellets': self.pellets.save_state(),
+            'player': self.__get_state_values(self.player),
+            'player_turns': vars(self.player.turns).copy(),
+            'ghosts': [self.__get_state_values(ghost) for ghost in self.ghosts],
+            'ghost_turns': [vars(ghost.turns).copy() for ghost in self.ghosts],
+            'scheduler': self.scheduler.save_state(),
+        }
 
-        if self.player.powerup:
-            pygame.draw.circle(self.screen, 'blue', self.powerup_circle_coordinates, 15)
-        for i in range(self.player.lives):
-            self.screen.blit(pygame.transform.scale(self.player.sprites[1], (30, 30)),
-                             (((self.screen.get_width() // 2) + (self.screen.get_width() // 4)) + i * 40,
-                              self.screen.get_height() - SCORE_SCREEN_OFFSET))
-        
-        if self.pause:
-            self.__show_pause_text()
+    def load_state(self, state: dict):
+        vars(self).update(state['engine'])
+        self.level.score = state['score']
+        # the pellets are shared with the player and the level
+        self.pellets.load_state(state['pellets'])
+        vars(self.player).update(state['player'])
+        vars(self.player.turns).update(state['player_turns'])
+        for ghost, values, turns in zip(self.ghosts, state['ghosts'], state['ghost_turns']):
+            vars(ghost).update(values)
+            vars(ghost.turns).update(turns)
+        self.scheduler.load_state(state['scheduler'])
+        # the entities may have jumped anywhere, their last movement starts over from where they are
+        for entity in [self.player] + self.ghosts:
+            position = entity.location_x, entity.location_y
+            self.collision_grid.move(entity, position, position)
 
-    def __show_pause_text(self):
-        self.flicker_counter += 1
-        if self.flicker_counter % FLICK_FREQUENCY == 0:
-            self.flick = not self.flick
-        if self.flicker_counter == FLICK_FREQUENCY * 2:
-            self.flicker_counter = 0
-        
-        if self.flick:
-            pause_text = self.game_font.render('RESUME', True, 'yellow')
-            self.screen.blit(pause_text, (self.screen.get_width() // 2 - 50, self.screen.get_height() // 2))
+    @staticmethod
+    def __get_state_values(instance):
+        return {name: value for name, value in vars(instance).items() if isinstance(value, STATE_TYPES)}
+
+    def check_ghosts_and_player_collision(self):
+        for ghost in self.collision_grid.find_collisions(self.player):
+            if ghost.is_frightened():
+                self.level.score += 50 * self.player.score_multiplier
+                self.player.score_multiplier += 1
+                ghost.set_to_eaten()
+                self.__notify(GameEvent.GHOST_EATEN)
+            elif (ghost.is_chasing() or ghost.is_scatter()) and not self.player.is_eaten():
+                self.frozen = True
+                self.scheduler.schedule(PLAYER_EATEN_FREEZE, self.Timer.UNFREEZE)
+                self.player.set_to_eaten()
+                self.__notify(GameEvent.PLAYER_EATEN)
+
+    def move_player(self):
+        start = self.player.location_x, self.player.location_y
+        turned = self.player.move(self.direction_command)
+        self.collision_grid.move(self.player, start, (self.player.location_x, self.player.location_y))
+        if not turned:
+            self.direction_command = self.player.direction
+        eaten = self.player.eat()
+        if eaten == EatenObject.DOT:
+            self.level.score += 10
+            self.__notify(GameEvent.DOT_EATEN, self.__get_player_board_tile())
+        elif eaten == EatenObject.BIG_DOT:
+            self.level.score += 50
+            self.__start_power_up()
+            self.__notify(GameEvent.POWER_PELLET_EATEN, self.__get_player_board_tile())
 
-    def render_ready_text(self):
-        ready_text = self.game_font.render(f'READY!', True, 'yellow')
-        self.screen.blit(ready_text, (self.screen.get_width() // 2 - 50, self.screen.get_height() // 2))
+    def __get_player_board_tile(self):
+        # In a tunnel the player may be on a tile out of the board, its pellet is the one of the opposite side
+        i, j = self.player.get_tile()
+        return i % self.board_height, j % self.board_width
 
-    def render_level(self):
-        self.__calculate_flick()
-        for i, row in enumerate(self.board):
-            for j, cell in enumerate(self.board[i]):
-                x, y = j * self.tile_width, i * self.tile_height
-                center = (x + self.tile_width / 2, y + self.tile_height / 2)
-                if cell == BoardStructure.DOT.value:
-                    pygame.draw.circle(self.screen, self.level.gate_color, center, 4)
-                elif cell == BoardStructure.BIG_DOT.value and not self.flick:
-                    pygame.draw.circle(self.screen, self.level.gate_color, center, 10)
-                elif cell == BoardStructure.VERTICAL_WALL.value:
-                    pygame.draw.line(self.screen, self.level.wall_color, (x + self.tile_width / 2, y),
-                                     (x + self.tile_width / 2, y + self.tile_height), 3)
-                elif cell == BoardStructure.HORIZONTAL_WALL.value:
-                    pygame.draw.line(self.screen, self.level.wall_color, (x, y + self.tile_height / 2),
-                                     (x + self.tile_width, y + self.tile_height / 2), 3)
-                elif cell == BoardStructure.TOP_RIGHT_CORNER.value:
-                    pygame.draw.arc(self.screen, self.level.wall_color,
-                                    [(j * self.tile_width - (self.tile_width * 0.4)) - 2,
-                                     (i * self.tile_height + (0.5 * self.tile_height)), self.tile_width,
-                                     self.tile_height],
-                                    0, PI / 2, 3)
-                elif cell == BoardStructure.TOP_LEFT_CORNER.value:
-                    pygame.draw.arc(self.screen, self.level.wall_color,
-                                    [(j * self.tile_width + (self.tile_width * 0.5)),
-                                     (i * self.tile_height + (0.5 * self.tile_height)),
-                                     self.tile_width, self.tile_height], PI / 2, PI,
-                                    3)
-                elif cell == BoardStructure.BOTTOM_LEFT_CORNER.value:
-                    pygame.draw.arc(self.screen, self.level.wall_color,
-                                    [(j * self.tile_width + (self.tile_width * 0.5)),
-                                     (i * self.tile_height - (0.4 * self.tile_height)),
-                                     self.tile_width, self.tile_height], PI,
-                                    3 * PI / 2, 3)
-                elif cell == BoardStructure.BOTTOM_RIGHT_CORNER.value:
-                    pygame.draw.arc(self.screen, self.level.wall_color,
-                                    [(j * self.tile_width - (self.tile_width * 0.4)) - 2,
-                                     (i * self.tile_height - (0.4 * self.tile_height)), self.tile_width,
-                                     self.tile_height],
-                                    3 * PI / 2,
-                                    2 * PI, 3)
-                elif cell == BoardStructure.GATE.value:
-                    pygame.draw.line(self.screen, self.level.gate_color,
-                                     (j * self.tile_width, i * self.tile_height + (0.5 * self.tile_height)),
-                                     (j * self.tile_width + self.tile_width,
-                                      i * self.tile_height + (0.5 * self.tile_height)), 3)
+    def get_ghost_targets(self):
+        # Screen positions the ghosts head for, all of them found from the state of the game now
+        player, ghosts = self.player, self.ghosts
+        snapshot = TargetingSnapshot(np.array([[player.location_x]]), np.array([[player.location_y]]),
+                                     np.array([[player.direction.value]]),
+                                     np.array([[ghost.location_x for ghost in ghosts]]),
+                                     np.array([[ghost.location_y for ghost in ghosts]]),
+                                     np.array([[ghost.state.value for ghost in ghosts]]))
+        target_x, target_y = self.targeting.evaluate(snapshot)
+        return list(zip(target_x[0].tolist(), target_y[0].tolist()))
 
-    def debug(self):
-        self.debug_grid()
-        self.debug_ghost_targets()
+    def move_ghosts(self):
+        # The ghosts at a junction choose their way to their target, the targets of a tick are found together
+        # before any ghost moves, and only on ticks where one of them has a choice to make
+        at_junction = [ghost.is_at_junction() for ghost in self.ghosts]
+        targets = self.get_ghost_targets() if any(at_junction) else [None] * len(self.ghosts)
+        for ghost, choosing, target in zip(self.ghosts, at_junction, targets):
+            start = ghost.location_x, ghost.location_y
+            ghost.follow_target(target if choosing else None)
+            self.collision_grid.move(ghost, start, (ghost.location_x, ghost.location_y))
 
-    def debug_ghost_targets(self):
+    def reset_ghosts(self):
         for ghost in self.ghosts:
-            if isinstance(ghost, Blinky):
-                pygame.draw.circle(self.screen, 'red', ghost.target(), 8)
-            elif isinstance(ghost, Pinky):
-                pygame.draw.circle(self.screen, 'pink', ghost.target(), 8)
-            elif isinstance(ghost, Inky):
-                pygame.draw.circle(self.screen, 'blue', ghost.target(), 8)
-            elif isinstance(ghost, Clyde):
-                pygame.draw.circle(self.screen, 'yellow', ghost.target(), 8)
+            ghost.reset_position()
 
-    def debug_grid(self):
-        # Draw additional grid to easily control object movements
-        for i in range(self.board_definition.width):
-            pygame.draw.line(self.screen, 'green',
-                             (i * self.tile_width, 0),
-                             (i * self.tile_width, self.board_definition.height * self.tile_height), 1)
-        for j in range(self.board_definition.height):
-            pygame.draw.line(self.screen, 'green',
-                             (0, j * self.tile_height),
-                             (self.board_definition.width * self.tile_width, j * self.tile_height), 1)
+    class Timer(enum.Enum):
+        # pacman can move after the start delay of a life
+        START = 0
+        # the game goes on after pacman was caught
+        UNFREEZE = 1
+        # ghost mode schedule
+        SCATTER = 2
+        CHASE = 3
+        # frightened ghosts start blinking, then the power up is over
+        POWER_UP_ENDING = 4
+        POWER_UP_OVER = 5
@@ -0,0 +1,309 @@
+import enum
+
+import pygame
+from pygame import Surface
+
+from draw.game_engine import GameEngine
+from draw.hud import Hud
+from draw.maze_renderer import MazeRenderer
+from draw.viewport import Viewport
+from model.game_event import GameEvent
+from settings import *
+
+FLICK_FREQUENCY = 20
+# (name, size) of the system fonts used
+GAME_FONT = ('Comic Sans MS', 30)
+GAME_OVER_FONT = ('arial', 40)
+PROFILER_FONT = ('monospace', 14)
+# frames between two refreshes of the profiler statistics on screen
+PROFILER_OVERLAY_REFRESH = 30
+# ghost kind -> color of its target in debug mode
+GHOST_TARGET_COLORS = {'blinky': 'red', 'pinky': 'pink', 'inky': 'blue', 'clyde': 'yellow'}
+
+
+class GameRenderer:
+    # Draws the state of a GameEngine, it observes the engine to know which tiles were eaten.
+    # What is on screen depends on the scene, scenes where little moves are drawn at a lower frame rate.
+    __fonts = {}
+
+    class Scene(enum.Enum):
+        PLAYING = 0
+        READY = 1
+        PAUSED = 2
+        GAME_OVER = 3
+
+    def __init__(self, screen: Surface, engine: GameEngine):
+        self.screen = screen
+        self.engine = engine
+        self.level = engine.level
+        self.player = engine.player
+        self.ghosts = engine.ghosts
+        self.board_definition = engine.board_definition
+        self.tile_width = engine.tile_width
+        self.tile_height = engine.tile_height
+        self.maze_renderer = MazeRenderer(self.level, self.tile_width, self.tile_height)
+        self.viewport = Viewport(self.screen.get_width(), self.screen.get_height() - SCORE_SCREEN_OFFSET,
+                                 *self.maze_renderer.size)
+        self.flicker_counter = 0
+        self.flick = True
+        self.hud = Hud(self.screen.get_size(), self.get_font(*GAME_FONT),
+                       self.player.sprites[1] if self.player.sprites else None)
+        self.banner_position = (self.screen.get_width() // 2 - 50, self.screen.get_height() // 2)
+        # rectangles touched during the current and the previous frame, used when presenting with DIRTY_RECTS
+        self.dirty_rects = []
+        self.previous_dirty_rects = []
+        self.full_redraw = True
+        self.profiler_font = None
+        self.profiler_overlay = None
+        self.profiler_overlay_age = 0
+        self.scene = None
+        # the frame of a scene that is drawn once and kept on screen: the one under the pause text, the game over
+        # screen. Only what is drawn over it changes, the areas drawn over it in the last frame.
+        self.scene_frame = None
+        self.scene_overlays = []
+        engine.add_observer(self)
+
+    @staticmethod
+    def get_font(name, size):
+        # Looking a font up may scan the system fonts, each one is only looked up once
+        font = GameRenderer.__fonts.get((name, size))
+        if font is None:
+            font = GameRenderer.__fonts[(name, size)] = pygame.font.SysFont(name, size)
+        return font
+
+    @staticmethod
+    def preload_fonts():
+        # Looks the fonts of the game up before the first renderer needs them, e.g. while the window comes up
+        for font in (GAME_FONT, GAME_OVER_FONT):
+            GameRenderer.get_font(*font)
+
+    def get_scene(self):
+        if self.engine.game_over:
+            return self.Scene.GAME_OVER
+        if self.engine.pause:
+            return self.Scene.PAUSED
+        if self.player.is_ready():
+            return self.Scene.READY
+        return self.Scene.PLAYING
+
+    def is_static(self):
+        # The screen keeps the frame of the scene, it must not be cleared before the next one
+        return self.scene_frame is not None and self.get_scene() == self.scene
+
+    def get_frame_rate(self):
+        # Frames per second the current scene needs, 0 when it only has to be drawn again after some input
+        return {self.Scene.PLAYING: MAX_RENDER_FPS, self.Scene.READY: READY_RENDER_FPS,
+                self.Scene.PAUSED: PAUSED_RENDER_FPS, self.Scene.GAME_OVER: GAME_OVER_RENDER_FPS}[self.get_scene()]
+
+    def on_event(self, event: GameEvent, tile):
+        if event == GameEvent.DOT_EATEN or event == GameEvent.POWER_PELLET_EATEN:
+            self.maze_renderer.clear_tile(*tile)
+            rect = self.maze_renderer.get_tile_rect(*tile)
+            if self.viewport.is_visible(rect):
+                self.mark_dirty(self.viewport.to_screen(rect))
+        elif event == GameEvent.LEVEL_COMPLETE:
+            self.maze_renderer.reset_pellets()
+            self.request_full_redraw()
+        elif event == GameEvent.GAME_RESET:
+            self.maze_renderer.reset_pellets()
+            self.flicker_counter = 0
+            self.flick = True
+            self.request_full_redraw()
+
+    def render(self, alpha=1.0, ticks=1):
+        # Draws entities at fraction alpha of the way between the last two ticks,
+        # animations advance by the ticks simulated since the previous frame
+        scene = self.get_scene()
+        if scene != self.scene:
+            if self.scene_frame is not None:
+                # the screen was not cleared, it still shows the previous scene
+                self.screen.fill(BACKGROUND_COLOR)
+            self.scene = scene
+            self.scene_frame = None
+            self.request_full_redraw()
+        if scene == self.Scene.GAME_OVER:
+            self.show_game_over()
+            return
+        profiler = self.engine.profiler
+        for _ in range(ticks):
+            self.__update_animations()
+        if scene == self.Scene.PAUSED and self.scene_frame is not None:
+            # nothing moves but the pause text
+            for rect in self.scene_overlays:
+                self.screen.blit(self.scene_frame, rect, rect)
+            drawn = len(self.dirty_rects)
+            self.__show_pause_text()
+            if profiler.enabled:
+                self.render_profiler_overlay()
+            self.scene_overlays = self.dirty_rects[drawn:]
+            return
+        if self.viewport.scrolling:
+            self.__follow_player(alpha)
+        # nothing of the maze is drawn over the score line
+        maze_area = (0, 0, self.viewport.rect.width, self.viewport.rect.height)
+        self.screen.set_clip(maze_area)
+        with profiler.phase('render_level'):
+            self.render_level()
+        self.screen.set_clip(None)
+        with profiler.phase('draw_misc'):
+            self.draw_misc()
+        self.screen.set_clip(maze_area)
+        with profiler.phase('render_ghosts'):
+            self.render_ghosts(alpha)
+        with profiler.phase('render_player'):
+            if not self.engine.pause:
+                if self.player.is_eaten():
+                    self.mark_dirty(self.player.render_death_animation(self.screen, alpha,
+                                                                       self.viewport.get_offset()))
+                else:
+                    if self.player.is_ready():
+                        self.render_ready_text()
+                    self.render_player(alpha)
+        if DEBUG:
+            self.request_full_redraw()
+            self.debug()
+        self.screen.set_clip(None)
+        if scene == self.Scene.PAUSED:
+            self.scene_frame = self.screen.copy()
+            drawn = len(self.dirty_rects)
+            self.__show_pause_text()
+            if profiler.enabled:
+                self.render_profiler_overlay()
+            self.scene_overlays = self.dirty_rects[drawn:]
+        elif profiler.enabled:
+            self.render_profiler_overlay()
+
+    def mark_dirty(self, rect):
+        if rect is not None:
+            self.dirty_rects.append(rect)
+
+    def request_full_redraw(self):
+        self.full_redraw = True
+
+    def collect_dirty_rects(self):
+        # Returns the screen areas to present for the last frame or None when the whole frame has to be flipped.
+        # Areas of the previous frame are included to erase sprites that moved away from there.
+        rects = None if self.full_redraw else self.previous_dirty_rects + self.dirty_rects
+        self.previous_dirty_rects = self.dirty_rects
+        self.dirty_rects = []
+        self.full_redraw = False
+        return rects
+
+    def show_game_over(self):
+        # Drawn once when the scene starts, the screen keeps it after
+        if self.scene_frame is None:
+            self.scene_frame = self.__draw_game_over()
+            self.screen.blit(self.scene_frame, (0, 0))
+
+    def __draw_game_over(self):
+        frame = Surface(self.screen.get_size())
+        frame.fill((0, 0, 0))
+        font = self.get_font(*GAME_OVER_FONT)
+        title = font.render('Game Over', True, 'red')
+        restart_button = font.render('Hit Space to restart', True, (255, 255, 255))
+        frame.blit(title, (
+            frame.get_width() / 2 - title.get_width() / 2, frame.get_height() / 2 - title.get_height() / 3))
+        frame.blit(restart_button, (frame.get_width() / 2 - restart_button.get_width() / 2,
+                                    frame.get_height() / 1.9 + restart_button.get_height()))
+
+        frame.blit(self.ghosts[0].assets.right[0],
+                   (frame.get_width() / 2, frame.get_height() / 2 + frame.get_height() / 6))
+        frame.blit(self.ghosts[1].assets.right[0],
+                   (frame.get_width() / 2 - frame.get_width() / 8, frame.get_height() / 2 + frame.get_height() / 6))
+        frame.blit(self.ghosts[2].assets.right[0],
+                   (frame.get_width() / 2 - frame.get_width() / 16, frame.get_height() / 2 + frame.get_height() / 6))
+        frame.blit(self.ghosts[3].assets.right[0],
+                   (frame.get_width() / 2 + frame.get_width() / 16, frame.get_height() / 2 + frame.get_height() / 6))
+        return frame
+
+    def __update_animations(self):
+        self.__calculate_flick()
+        if self.engine.pause:
+            # the pause text blinks twice as fast
+            self.__calculate_flick()
+        for ghost in self.ghosts:
+            ghost.update_animation()
+        if not self.engine.pause and not self.player.is_eaten():
+            self.player.update_animation()
+
+    def __follow_player(self, alpha):
+        x, y = self.player.get_render_position(alpha)
+        if self.viewport.follow(x + SPRITE_SIZE[0] // 2, y + SPRITE_SIZE[1] // 2):
+            # everything moved on screen
+            self.request_full_redraw()
+
+    def __is_visible(self, entity, alpha):
+        return self.viewport.is_visible((entity.get_render_position(alpha), SPRITE_SIZE))
+
+    def render_player(self, alpha=1.0):
+        self.mark_dirty(self.player.render(self.screen, alpha, self.viewport.get_offset()))
+
+    def render_ghosts(self, alpha=1.0):
+        for ghost in self.ghosts:
+            if self.__is_visible(ghost, alpha):
+                self.mark_dirty(ghost.render(self.screen, alpha, self.viewport.get_offset()))
+
+    def __calculate_flick(self):
+        self.flicker_counter += 1
+        if self.flicker_counter % FLICK_FREQUENCY == 0:
+            self.flick = not self.flick
+        if self.flicker_counter == FLICK_FREQUENCY * 2:
+            self.flicker_counter = 0
+
+    def draw_misc(self):
+        # the score line is only presented again when it changed
+        self.mark_dirty(self.hud.render(self.screen, self.level.score, self.player.lives, self.player.powerup))
+
+    def __show_pause_text(self):
+        if self.flick:
+            self.mark_dirty(self.hud.render_banner(self.screen, 'RESUME', 'yellow', self.banner_position))
+
+    def render_ready_text(self):
+        self.mark_dirty(self.hud.render_banner(self.screen, 'READY!', 'yellow', self.banner_position))
+
+    def render_level(self):
+        self.maze_renderer.render(self.screen, self.flick, self.viewport)
+        self.dirty_rects.extend(self.maze_renderer.get_power_pellet_rects(self.viewport))
+
+    def debug(self):
+        self.debug_grid()
+        self.debug_ghost_targets()
+
+    def render_profiler_overlay(self):
+        # Rolling percentiles of the phase durations, redrawn every PROFILER_OVERLAY_REFRESH frames
+        if self.profiler_overlay is None or self.profiler_overlay_age >= PROFILER_OVERLAY_REFRESH:
+            if self.profiler_font is None:
+                self.profiler_font = self.get_font(*PROFILER_FONT)
+            lines = [f'{"phase":<14}{"p50":>7}{"p95":>7}{"p99":>7} ms']
+            for name, (p50, p95, p99) in self.engine.profiler.get_statistics().items():
+                lines.append(f'{name:<14}{p50:7.2f}{p95:7.2f}{p99:7.2f}')
+            texts = [self.profiler_font.render(line, True, 'green') for line in lines]
+            line_height = self.profiler_font.get_linesize()
+            self.profiler_overlay = pygame.Surface((max(text.get_width() for text in texts) + 10,
+                                                    line_height * len(texts) + 10))
+            self.profiler_overlay.set_alpha(200)
+            for n, text in enumerate(texts):
+                self.profiler_overlay.blit(text, (5, 5 + n * line_height))
+            self.profiler_overlay_age = 0
+        self.profiler_overlay_age += 1
+        self.mark_dirty(self.screen.blit(self.profiler_overlay, (5, 5)))
+
+    def debug_ghost_targets(self):
+        offset_x, offset_y = self.viewport.get_offset()
+        for ghost, (x, y) in zip(self.ghosts, self.engine.get_ghost_targets()):
+            color = GHOST_TARGET_COLORS.get(ghost.kind, 'white')
+            pygame.draw.circle(self.screen, color, (x + offset_x, y + offset_y), 8)
+
+    def debug_grid(self):
+        # Draw additional grid to easily control object movements
+        offset_x, offset_y = self.viewport.get_offset()
+        rows, columns = self.viewport.get_tiles(self.tile_width, self.tile_height, self.board_definition.height,
+                                                self.board_definition.width)
+        bottom = self.board_definition.height * self.tile_height + offset_y
+        right = self.board_definition.width * self.tile_width + offset_x
+        for i in columns:
+            pygame.draw.line(self.screen, 'green', (i * self.tile_width + offset_x, 0),
+                             (i * self.tile_width + offset_x, bottom), 1)
+        for j in rows:
+            pygame.draw.line(self.screen, 'green', (0, j * self.tile_height + offset_y),
+                             (right, j * self.tile_height + offset_y), 1)
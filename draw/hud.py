@@ -0,0 +1,60 @@
+import pygame
+from pygame import Surface
+
+from settings import *
+
+SCORE_LABEL = 'Score: '
+POWER_UP_CENTER = (250, 15)
+POWER_UP_RADIUS = 15
+LIFE_ICON_SIZE = (30, 30)
+LIFE_ICON_SPACING = 40
+
+
+class Hud:
+    # The score line under the maze and the banners over it. A widget is rendered again only when its value changes:
+    # the score is put together from glyphs rendered once, and the score line is composed on its own surface that
+    # is drawn with a single blit.
+
+    def __init__(self, screen_size, font: pygame.font.Font, life_sprite: Surface = None):
+        width, height = screen_size
+        self.rect = pygame.Rect(0, height - SCORE_SCREEN_OFFSET, width, SCORE_SCREEN_OFFSET)
+        self.font = font
+        # text -> rendered text, for the digits, the score label and the banners
+        self.glyphs = {}
+        self.life_icon = pygame.transform.scale(life_sprite, LIFE_ICON_SIZE) if life_sprite is not None else None
+        self.strip = Surface(self.rect.size)
+        # score, lives and power up shown by strip, None until it is composed
+        self.values = None
+
+    def get_glyph(self, text, color='white'):
+        glyph = self.glyphs.get((text, color))
+        if glyph is None:
+            glyph = self.glyphs[(text, color)] = self.font.render(text, True, color)
+        return glyph
+
+    def render(self, screen: Surface, score, lives, powerup):
+        # Draws the score line, returns its rect when it shows other values than on the previous call
+        values = (score, lives, powerup)
+        changed = values != self.values
+        if changed:
+            self.__compose(*values)
+            self.values = values
+        screen.blit(self.strip, self.rect)
+        return self.rect if changed else None
+
+    def render_banner(self, screen: Surface, text, color, position):
+        return screen.blit(self.get_glyph(text, color), position)
+
+    def __compose(self, score, lives, powerup):
+        self.strip.fill(BACKGROUND_COLOR)
+        x = SCORE_SCREEN_OFFSET
+        for text in [SCORE_LABEL] + list(str(score)):
+            glyph = self.get_glyph(text)
+            self.strip.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        if powerup:
+            pygame.draw.circle(self.strip, 'blue', POWER_UP_CENTER, POWER_UP_RADIUS)
+        if self.life_icon is not None:
+            first_life = self.rect.width // 2 + self.rect.width // 4
+            for i in range(lives):
+                self.strip.blit(self.life_icon, (first_life + i * LIFE_ICON_SPACING, 0))
@@ -0,0 +1,183 @@
+import math
+from collections import OrderedDict
+
+import pygame
+from pygame import Surface
+
+from draw.viewport import Viewport
+from model.board_structure import BoardStructure
+from model.level_config import LevelConfig
+from settings import MAZE_CHUNK_CACHE, MAZE_CHUNK_TILES
+
+PI = math.pi
+
+# Color used as transparent key of the cached layers
+TRANSPARENT_COLOR = (0, 0, 0)
+DOT_RADIUS = 4
+BIG_DOT_RADIUS = 10
+WALL_THICKNESS = 3
+
+
+class MazeRenderer:
+    # The maze is drawn from square pieces of MAZE_CHUNK_TILES tiles, built when they first come into view and
+    # dropped when they were not shown for a while. Walls and gate never change while a level is played, so their
+    # pieces are shared by every renderer built for the same level layout. Dots are drawn again from the pellets.
+    __walls_cache = {}
+
+    def __init__(self, level: LevelConfig, tile_width, tile_height):
+        self.level = level
+        self.board_definition = level.board_definition
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.size = (level.board_definition.width * tile_width, level.board_definition.height * tile_height)
+        self.chunk_width = MAZE_CHUNK_TILES * tile_width
+        self.chunk_height = MAZE_CHUNK_TILES * tile_height
+        self.chunk_rows = math.ceil(level.board_definition.height / MAZE_CHUNK_TILES)
+        self.chunk_columns = math.ceil(level.board_definition.width / MAZE_CHUNK_TILES)
+        self.walls = self.__get_walls_chunks()
+        # (chunk row, chunk column) -> piece of the dots layer
+        self.dots = OrderedDict()
+        # (chunk row, chunk column) -> {(i, j): center} of the power pellets left in the chunk
+        self.power_pellets = self.__find_power_pellets()
+
+    def render(self, screen: Surface, flick, viewport: Viewport):
+        offset_x, offset_y = viewport.get_offset()
+        chunks = self.__get_visible_chunks(viewport)
+        for chunk in chunks:
+            position = (chunk[1] * self.chunk_width + offset_x, chunk[0] * self.chunk_height + offset_y)
+            screen.blit(self.__get_chunk(self.walls, chunk, self.__build_walls_chunk), position)
+            screen.blit(self.__get_chunk(self.dots, chunk, self.__build_dots_chunk), position)
+        if not flick:
+            for chunk in chunks:
+                for x, y in self.power_pellets.get(chunk, {}).values():
+                    pygame.draw.circle(screen, self.level.gate_color, (x + offset_x, y + offset_y), BIG_DOT_RADIUS)
+
+    def reset_pellets(self):
+        # Called when the pellets are all back on the board
+        self.dots.clear()
+        self.power_pellets = self.__find_power_pellets()
+
+    def clear_tile(self, i, j):
+        # Called when the player eats the content of a tile
+        chunk = (i // MAZE_CHUNK_TILES, j // MAZE_CHUNK_TILES)
+        dots = self.dots.get(chunk)
+        if dots is not None:
+            dots.fill(TRANSPARENT_COLOR, self.get_tile_rect(i, j).move(-chunk[1] * self.chunk_width,
+                                                                        -chunk[0] * self.chunk_height))
+        self.power_pellets.get(chunk, {}).pop((i, j), None)
+
+    def get_power_pellet_rects(self, viewport: Viewport):
+        # Pellets flicker, so their tiles change even when nothing moves over them
+        return [viewport.to_screen(self.get_tile_rect(i, j)) for chunk in self.__get_visible_chunks(viewport)
+                for i, j in self.power_pellets.get(chunk, ())]
+
+    def get_tile_rect(self, i, j):
+        return pygame.Rect(j * self.tile_width, i * self.tile_height, self.tile_width, self.tile_height)
+
+    def __get_center(self, i, j):
+        return j * self.tile_width + self.tile_width / 2, i * self.tile_height + self.tile_height / 2
+
+    def __get_visible_chunks(self, viewport: Viewport):
+        rows, columns = viewport.get_tiles(self.chunk_width, self.chunk_height, self.chunk_rows, self.chunk_columns)
+        return [(row, column) for row in rows for column in columns]
+
+    @staticmethod
+    def __get_chunk(chunks: OrderedDict, chunk, build):
+        layer = chunks.get(chunk)
+        if layer is None:
+            layer = chunks[chunk] = build(*chunk)
+            if len(chunks) > MAZE_CHUNK_CACHE:
+                chunks.popitem(last=False)
+        else:
+            chunks.move_to_end(chunk)
+        return layer
+
+    def __new_layer(self, row, column):
+        # chunks of the last row and column stop with the maze
+        layer = Surface((min(self.chunk_width, self.size[0] - column * self.chunk_width),
+                         min(self.chunk_height, self.size[1] - row * self.chunk_height)))
+        layer.fill(TRANSPARENT_COLOR)
+        return layer
+
+    def __get_chunk_tiles(self, row, column, margin=0):
+        # rows and columns of the tiles of a chunk and of margin tiles around it
+        first_i, first_j = row * MAZE_CHUNK_TILES - margin, column * MAZE_CHUNK_TILES - margin
+        return (range(max(first_i, 0), min(first_i + MAZE_CHUNK_TILES + 2 * margin, self.board_definition.height)),
+                range(max(first_j, 0), min(first_j + MAZE_CHUNK_TILES + 2 * margin, self.board_definition.width)))
+
+    def __get_walls_chunks(self):
+        structure = self.board_definition.structure
+        key = (str(self.level.wall_color), str(self.level.gate_color), self.tile_width, self.tile_height,
+               structure.shape, structure.tobytes())
+        return MazeRenderer.__walls_cache.setdefault(key, OrderedDict())
+
+    def __build_walls_chunk(self, row, column):
+        walls = self.__new_layer(row, column)
+        origin = column * self.chunk_width, row * self.chunk_height
+        structure = self.board_definition.structure_rows
+        # corners are drawn a little over the next tile, the tiles around the chunk can reach into it
+        rows, columns = self.__get_chunk_tiles(row, column, margin=1)
+        for i in rows:
+            for j in columns:
+                self.__draw_wall(walls, structure[i][j], i, j, origin)
+        walls.set_colorkey(TRANSPARENT_COLOR, pygame.RLEACCEL)
+        return walls
+
+    def __build_dots_chunk(self, row, column):
+        dots = self.__new_layer(row, column)
+        x, y = column * self.chunk_width, row * self.chunk_height
+        pellets = self.board_definition.pellets
+        rows, columns = self.__get_chunk_tiles(row, column)
+        for i in rows:
+            for j in columns:
+                if pellets.get(i, j) == BoardStructure.DOT.value:
+                    center_x, center_y = self.__get_center(i, j)
+                    pygame.draw.circle(dots, self.level.gate_color, (center_x - x, center_y - y), DOT_RADIUS)
+        dots.set_colorkey(TRANSPARENT_COLOR, pygame.RLEACCEL)
+        return dots
+
+    def __find_power_pellets(self):
+        power_pellets = {}
+        for i, j in self.board_definition.pellets.get_tiles(BoardStructure.BIG_DOT.value):
+            chunk = (i // MAZE_CHUNK_TILES, j // MAZE_CHUNK_TILES)
+            power_pellets.setdefault(chunk, {})[(i, j)] = self.__get_center(i, j)
+        return power_pellets
+
+    def __draw_wall(self, surface, cell, i, j, origin):
+        x, y = j * self.tile_width, i * self.tile_height
+        point = self.__to_layer
+        if cell == BoardStructure.VERTICAL_WALL.value:
+            pygame.draw.line(surface, self.level.wall_color, point(origin, x + self.tile_width / 2, y),
+                             point(origin, x + self.tile_width / 2, y + self.tile_height), WALL_THICKNESS)
+        elif cell == BoardStructure.HORIZONTAL_WALL.value:
+            pygame.draw.line(surface, self.level.wall_color, point(origin, x, y + self.tile_height / 2),
+                             point(origin, x + self.tile_width, y + self.tile_height / 2), WALL_THICKNESS)
+        elif cell == BoardStructure.TOP_RIGHT_CORNER.value:
+            pygame.draw.arc(surface, self.level.wall_color,
+                            [*point(origin, (x - (self.tile_width * 0.4)) - 2, (y + (0.5 * self.tile_height))),
+                             self.tile_width, self.tile_height],
+                            0, PI / 2, WALL_THICKNESS)
+        elif cell == BoardStructure.TOP_LEFT_CORNER.value:
+            pygame.draw.arc(surface, self.level.wall_color,
+                            [*point(origin, (x + (self.tile_width * 0.5)), (y + (0.5 * self.tile_height))),
+                             self.tile_width, self.tile_height],
+                            PI / 2, PI, WALL_THICKNESS)
+        elif cell == BoardStructure.BOTTOM_LEFT_CORNER.value:
+            pygame.draw.arc(surface, self.level.wall_color,
+                            [*point(origin, (x + (self.tile_width * 0.5)), (y - (0.4 * self.tile_height))),
+                             self.tile_width, self.tile_height],
+                            PI, 3 * PI / 2, WALL_THICKNESS)
+        elif cell == BoardStructure.BOTTOM_RIGHT_CORNER.value:
+            pygame.draw.arc(surface, self.level.wall_color,
+                            [*point(origin, (x - (self.tile_width * 0.4)) - 2, (y - (0.4 * self.tile_height))),
+                             self.tile_width, self.tile_height],
+                            3 * PI / 2, 2 * PI, WALL_THICKNESS)
+        elif cell == BoardStructure.GATE.value:
+            pygame.draw.line(surface, self.level.gate_color, point(origin, x, y + (0.5 * self.tile_height)),
+                             point(origin, x + self.tile_width, y + (0.5 * self.tile_height)), WALL_THICKNESS)
+
+    @staticmethod
+    def __to_layer(origin, x, y):
+        # Drawing truncates float coordinates: truncating in maze coordinates, before moving to the chunk, keeps
+        # the pixels of a wall the same whichever chunk it is drawn on
+        return int(x) - origin[0], int(y) - origin[1]
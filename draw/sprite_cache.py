@@ -0,0 +1,45 @@
+import pygame
+from pygame import Surface
+
+from model.asset import Asset
+
+
+def convert_image(image: Surface) -> Surface:
+    # Sprites can be loaded without a window, e.g. by headless tools; they are kept in file format then
+    if pygame.display.get_surface() is None:
+        return image
+    return image.convert_alpha()
+
+
+def convert_images(images: list) -> list:
+    return [convert_image(image) for image in images]
+
+
+def convert_asset(asset: Asset) -> Asset:
+    return Asset(left=convert_images(asset.left), right=convert_images(asset.right),
+                 up=convert_images(asset.up), down=convert_images(asset.down))
+
+
+def build_player_asset(images: list) -> Asset:
+    # Player images face right, every other direction is derived once here instead of on each frame
+    right = convert_images(images)
+    return Asset(left=[pygame.transform.flip(image, True, False) for image in right],
+                 right=right,
+                 up=[pygame.transform.rotate(image, 90) for image in right],
+                 down=[pygame.transform.rotate(image, 270) for image in right])
+
+
+class SpriteCache:
+    # Ready to blit sprites in display pixel format, built once per level
+
+    def __init__(self, player_images: list, death_animation_images: list, blinky: Asset, pinky: Asset,
+                 inky: Asset, clyde: Asset, frightened: list, eaten: Asset, blink: list):
+        self.player = build_player_asset(player_images)
+        self.player_death = convert_images(death_animation_images)
+        self.blinky = convert_asset(blinky)
+        self.pinky = convert_asset(pinky)
+        self.inky = convert_asset(inky)
+        self.clyde = convert_asset(clyde)
+        self.frightened = convert_images(frightened)
+        self.eaten = convert_asset(eaten)
+        self.blink = convert_images(blink)
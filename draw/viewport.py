@@ -0,0 +1,49 @@
+import math
+
+import pygame
+
+from model.board_definition import BoardDefinition
+from settings import *
+
+
+def get_tile_size(board_definition: BoardDefinition, resolution=RESOLUTION, tile_size=VIEWPORT_TILE_SIZE):
+    # Tiles fit the maze in the window unless they have a fixed size
+    if tile_size is not None:
+        return tuple(tile_size)
+    width, height = resolution
+    return width // board_definition.width, (height - SCORE_SCREEN_OFFSET) // board_definition.height
+
+
+class Viewport:
+    # Area of the maze shown on screen, in maze pixels. When the maze is larger than the view it follows pacman
+    # and only what it intersects is drawn, so a frame costs the same whatever the size of the maze.
+
+    def __init__(self, width, height, maze_width, maze_height):
+        self.rect = pygame.Rect(0, 0, width, height)
+        self.maze_width = maze_width
+        self.maze_height = maze_height
+        self.scrolling = maze_width > width or maze_height > height
+
+    def follow(self, x, y):
+        # Centers the view on (x, y) without showing past the maze, returns whether the view moved
+        left = min(max(x - self.rect.width // 2, 0), max(self.maze_width - self.rect.width, 0))
+        top = min(max(y - self.rect.height // 2, 0), max(self.maze_height - self.rect.height, 0))
+        if (left, top) == self.rect.topleft:
+            return False
+        self.rect.topleft = left, top
+        return True
+
+    def get_offset(self):
+        # what to add to maze coordinates to get screen coordinates
+        return -self.rect.x, -self.rect.y
+
+    def to_screen(self, rect):
+        return rect.move(-self.rect.x, -self.rect.y)
+
+    def is_visible(self, rect):
+        return self.rect.colliderect(rect)
+
+    def get_tiles(self, tile_width, tile_height, rows, columns):
+        # rows and columns of the tiles the view intersects, tile_width and tile_height can be those of a chunk
+        return (range(max(self.rect.top // tile_height, 0), min(math.ceil(self.rect.bottom / tile_height), rows)),
+                range(max(self.rect.left // tile_width, 0), min(math.ceil(self.rect.right / tile_width), columns)))
@@ -0,0 +1,7 @@
+from levels.level_loader import load_level
+from model.level_config import LevelConfig
+from settings import *
+
+
+def create_default_level() -> LevelConfig:
+    return load_level(DEFAULT_LEVEL)
@@ -1,12 +1,13 @@
-from pathlib import Path
 from pygame import Surface
-from draw.game_engine import SCORE_SCREEN_OFFSET, GameEngine
+from draw.game_engine import GameEngine
+from draw.sprite_cache import SpriteCache
+from draw.viewport import get_tile_size
+from levels.level_loader import GHOST_NAMES
+from levels.sprite_atlas import load_sprite_images
 from model.asset import Asset
-from model.entity.ghost.blinky import Blinky
-from model.entity.ghost.clyde import Clyde
-from model.entity.ghost.inky import Inky
-from model.entity.ghost.pinky import Pinky
+from model.entity.ghost.ghost import Ghost
 from model.level_config import LevelConfig
+from model.navigation.distance_fields import DistanceFields
 from model.entity.player.player import *
 from model.space_params.space_params import SpaceParams
 from model.turns import Turns
@@ -15,134 +16,79 @@ from settings import *
 
 class LevelContentInitializer:
 
-    def __init__(self, level: LevelConfig, screen: Surface):
+    def __init__(self, level: LevelConfig, screen: Surface = None, resolution=RESOLUTION, tile_size=VIEWPORT_TILE_SIZE,
+                 images: dict = None):
+        # Without a screen the level is built for a headless simulation: nothing is drawn, so no sprites are loaded.
+        # images are the sprite images by atlas key when they were loaded before
         self.level = level
         self.screen = screen
-        self.tile_height = ((self.screen.get_height() - SCORE_SCREEN_OFFSET) // level.board_definition.height)
-        self.tile_width = (self.screen.get_width() // level.board_definition.width)
-        self.player = self.__load_player()
+        self.tile_width, self.tile_height = get_tile_size(
+            level.board_definition, screen.get_size() if screen is not None else resolution, tile_size)
+        self.sprites = None
+        if screen is not None:
+            self.images = images if images is not None else load_sprite_images()
+            self.sprites = SpriteCache(*self.render_player_assets(), *self.render_ghosts_assets())
 
     def __load_player(self):
-        player_images, death_animation_images = self.render_player_assets()
-
-        initial_position = (PLAYER_X * self.tile_width + (self.tile_width // 2),
-                            PLAYER_Y * self.tile_height + (self.tile_height // 2))
-
         space_params = SpaceParams(self.level.board_definition, self.tile_width, self.tile_height, 21)
-        return Player(player_images, initial_position, Turns(), space_params, death_animation_images)
+        return Player(self.__get_sprites('player'), self.__to_tile_center(self.level.player_position), Turns(),
+                      space_params, self.__get_sprites('player_death'))
 
-    def __load_ghosts(self, player: Player):
-        blinky_location = (BLINKY_X * self.tile_width + self.tile_width // 2,
-                           BLINKY_Y * self.tile_height + self.tile_height // 2)
-        pinky_location = (PINKY_X * self.tile_width + self.tile_width // 2,
-                          PINKY_Y * self.tile_height + self.tile_height // 2)
-        inky_location = (INKY_X * self.tile_width + self.tile_width // 2,
-                         INKY_Y * self.tile_height + self.tile_height // 2)
-        clyde_location = (CLYDE_X * self.tile_width + self.tile_width // 2,
-                          CLYDE_Y * self.tile_height + self.tile_height // 2)
+    def __to_tile_center(self, tile):
+        return tile[0] * self.tile_width + self.tile_width // 2, tile[1] * self.tile_height + self.tile_height // 2
 
+    def __load_ghosts(self, player: Player):
         turns = Turns()
         space_params = SpaceParams(self.level.board_definition, self.tile_width, self.tile_height, 21)
-        blinky_assets, pinky_assets, inky_assets, \
-            clyde_assets, frightened_assets, eaten_assets, blink_assets = self.render_ghosts_assets()
-
-        blinky = Blinky(center_position=blinky_location,
-                        assets=blinky_assets, frightened_assets=frightened_assets, eaten_assets=eaten_assets,
-                        blink_assets=blink_assets, player=player, turns=turns, space_params=space_params, home_corner=BLINKY_CORNER,
-                        ghost_house_location=GHOST_HOUSE_LOCATION, ghost_house_exit=GHOST_HOUSE_EXIT)
-        pinky = Pinky(center_position=pinky_location,
-                      assets=pinky_assets, frightened_assets=frightened_assets, eaten_assets=eaten_assets,
-                      blink_assets=blink_assets, player=player, turns=turns, space_params=space_params, home_corner=PINKY_CORNER,
-                      ghost_house_location=GHOST_HOUSE_LOCATION, ghost_house_exit=GHOST_HOUSE_EXIT)
-        inky = Inky(center_position=inky_location,
-                    assets=inky_assets, frightened_assets=frightened_assets, eaten_assets=eaten_assets,
-                    blink_assets=blink_assets, player=player, turns=turns, space_params=space_params, home_corner=INKY_CORNER,
-                    blinky=blinky,
-                    ghost_house_location=GHOST_HOUSE_LOCATION, ghost_house_exit=GHOST_HOUSE_EXIT)
-        clyde = Clyde(center_position=clyde_location,
-                      assets=clyde_assets, frightened_assets=frightened_assets, eaten_assets=eaten_assets,
-                      blink_assets=blink_assets, player=player, turns=turns, space_params=space_params, home_corner=CLYDE_CORNER,
-                      ghost_house_location=GHOST_HOUSE_LOCATION, ghost_house_exit=GHOST_HOUSE_EXIT)
-
-        return [blinky, pinky, inky, clyde]
+        frightened_assets, eaten_assets, blink_assets = \
+            self.__get_sprites('frightened'), self.__get_sprites('eaten'), self.__get_sprites('blink')
+
+        def ghost_params(name):
+            return dict(kind=name, center_position=self.__to_tile_center(self.level.ghost_positions[name]),
+                        assets=self.__get_sprites(name), frightened_assets=frightened_assets,
+                        eaten_assets=eaten_assets, blink_assets=blink_assets, player=player, turns=turns,
+                        space_params=space_params, home_corner=self.level.ghost_corners[name],
+                        ghost_house_location=self.level.ghost_house_location,
+                        ghost_house_exit=self.level.ghost_house_exit, ghost_house_bounds=self.level.ghost_house_bounds)
+
+        # what each ghost does comes from the targeting strategy of its kind, see GhostTargeting
+        ghosts = [Ghost(**ghost_params(name)) for name in GHOST_NAMES]
+        if MAZE_NAVIGATION:
+            navigation = DistanceFields.shared(self.level.board_definition)
+            for ghost in ghosts:
+                ghost.use_navigation(navigation)
+        return ghosts
 
     def init_game_engine(self):
         player = self.__load_player()
         ghosts = self.__load_ghosts(player)
-        return GameEngine(self.screen, self.level, player, ghosts)
-
-    def render_player_assets(self):
-        player_images = []
-
-        for i in range(1, 5):
-            player_images.append(pygame.transform.scale(pygame.image.load(f'assets/player_images/{i}.png'),
-                                                        SPRITE_SIZE))
+        return GameEngine(self.level, player, ghosts, self.tile_width, self.tile_height)
 
-        death_animation_images = []
+    def __get_sprites(self, name):
+        return getattr(self.sprites, name) if self.sprites is not None else None
 
-        for i in range(1, 13):
-            death_animation_images.append(pygame.transform.scale(pygame.image.load(f'assets/player_images/death_animation/{i}.png'),
-                                                        SPRITE_SIZE))
+    def render_player_assets(self):
+        player_images = [self.images[f'player/{i}'] for i in range(1, 5)]
+        death_animation_images = [self.images[f'player/death/{i}'] for i in range(1, DEATH_ANIMATION_FRAMES + 1)]
         return player_images, death_animation_images
 
     def render_ghosts_assets(self):
-        blinky_folder = Path('assets/ghost_images/blinky')
-        pinky_folder = Path('assets/ghost_images/pinky')
-        inky_folder = Path('assets/ghost_images/inky')
-        clyde_folder = Path('assets/ghost_images/clyde')
-        eaten_folder = Path('assets/ghost_images/eaten')
-
-        blinky_assets = Asset(
-            left=[pygame.transform.scale(pygame.image.load(blinky_folder.joinpath('left1.png')), SPRITE_SIZE),
-                  pygame.transform.scale(pygame.image.load(blinky_folder.joinpath('left2.png')), SPRITE_SIZE)],
-            right=[pygame.transform.scale(pygame.image.load(blinky_folder.joinpath('right1.png')), SPRITE_SIZE),
-                   pygame.transform.scale(pygame.image.load(blinky_folder.joinpath('right2.png')), SPRITE_SIZE)],
-            up=[pygame.transform.scale(pygame.image.load(blinky_folder.joinpath('up1.png')), SPRITE_SIZE),
-                pygame.transform.scale(pygame.image.load(blinky_folder.joinpath('up2.png')), SPRITE_SIZE)],
-            down=[pygame.transform.scale(pygame.image.load(blinky_folder.joinpath('down1.png')), SPRITE_SIZE),
-                  pygame.transform.scale(pygame.image.load(blinky_folder.joinpath('down2.png')), SPRITE_SIZE)])
-
-        pinky_assets = Asset(
-            left=[pygame.transform.scale(pygame.image.load(pinky_folder.joinpath('left1.png')), SPRITE_SIZE),
-                  pygame.transform.scale(pygame.image.load(pinky_folder.joinpath('left2.png')), SPRITE_SIZE)],
-            right=[pygame.transform.scale(pygame.image.load(pinky_folder.joinpath('right1.png')), SPRITE_SIZE),
-                   pygame.transform.scale(pygame.image.load(pinky_folder.joinpath('right2.png')), SPRITE_SIZE)],
-            up=[pygame.transform.scale(pygame.image.load(pinky_folder.joinpath('up1.png')), SPRITE_SIZE),
-                pygame.transform.scale(pygame.image.load(pinky_folder.joinpath('up2.png')), SPRITE_SIZE)],
-            down=[pygame.transform.scale(pygame.image.load(pinky_folder.joinpath('down1.png')), SPRITE_SIZE),
-                  pygame.transform.scale(pygame.image.load(pinky_folder.joinpath('down2.png')), SPRITE_SIZE)])
-        inky_assets = Asset(
-            left=[pygame.transform.scale(pygame.image.load(inky_folder.joinpath('left1.png')), SPRITE_SIZE),
-                  pygame.transform.scale(pygame.image.load(inky_folder.joinpath('left2.png')), SPRITE_SIZE)],
-            right=[pygame.transform.scale(pygame.image.load(inky_folder.joinpath('right1.png')), SPRITE_SIZE),
-                   pygame.transform.scale(pygame.image.load(inky_folder.joinpath('right2.png')), SPRITE_SIZE)],
-            up=[pygame.transform.scale(pygame.image.load(inky_folder.joinpath('up1.png')), SPRITE_SIZE),
-                pygame.transform.scale(pygame.image.load(inky_folder.joinpath('up2.png')), SPRITE_SIZE)],
-            down=[pygame.transform.scale(pygame.image.load(inky_folder.joinpath('down1.png')), SPRITE_SIZE),
-                  pygame.transform.scale(pygame.image.load(inky_folder.joinpath('down2.png')), SPRITE_SIZE)])
-        clyde_assets = Asset(
-            left=[pygame.transform.scale(pygame.image.load(clyde_folder.joinpath('left1.png')), SPRITE_SIZE),
-                  pygame.transform.scale(pygame.image.load(clyde_folder.joinpath('left2.png')), SPRITE_SIZE)],
-            right=[pygame.transform.scale(pygame.image.load(clyde_folder.joinpath('right1.png')), SPRITE_SIZE),
-                   pygame.transform.scale(pygame.image.load(clyde_folder.joinpath('right2.png')), SPRITE_SIZE)],
-            up=[pygame.transform.scale(pygame.image.load(clyde_folder.joinpath('up1.png')), SPRITE_SIZE),
-                pygame.transform.scale(pygame.image.load(clyde_folder.joinpath('up2.png')), SPRITE_SIZE)],
-            down=[pygame.transform.scale(pygame.image.load(clyde_folder.joinpath('down1.png')), SPRITE_SIZE),
-                  pygame.transform.scale(pygame.image.load(clyde_folder.joinpath('down2.png')), SPRITE_SIZE)])
-
-        frightened_assets = [pygame.transform.scale(pygame.image.load('assets/ghost_images/scared_1.png'), SPRITE_SIZE),
-                             pygame.transform.scale(pygame.image.load('assets/ghost_images/scared_2.png'), SPRITE_SIZE)]
-
-        eaten_assets = Asset(left=[pygame.transform.scale(pygame.image.load(eaten_folder.joinpath('eyes_left.png')), SPRITE_SIZE)],
-                             right=[pygame.transform.scale(pygame.image.load(eaten_folder.joinpath('eyes_right.png')), SPRITE_SIZE)],
-                             down=[pygame.transform.scale(pygame.image.load(eaten_folder.joinpath('eyes_down.png')), SPRITE_SIZE)],
-                             up=[pygame.transform.scale(pygame.image.load(eaten_folder.joinpath('eyes_up.png')), SPRITE_SIZE)])
-
-        blink_assets = [pygame.transform.scale(pygame.image.load('assets/ghost_images/scared_1.png'), SPRITE_SIZE),
-                        pygame.transform.scale(pygame.image.load('assets/ghost_images/scared_3.png'), SPRITE_SIZE)]
+        blinky_assets = self.__ghost_asset('blinky')
+        pinky_assets = self.__ghost_asset('pinky')
+        inky_assets = self.__ghost_asset('inky')
+        clyde_assets = self.__ghost_asset('clyde')
 
-        return blinky_assets, pinky_assets, inky_assets, clyde_assets, frightened_assets, eaten_assets, blink_assets
+        frightened_assets = [self.images['ghost/scared_1'], self.images['ghost/scared_2']]
 
+        eaten_assets = Asset(left=[self.images['ghost/eaten/left']], right=[self.images['ghost/eaten/right']],
+                             up=[self.images['ghost/eaten/up']], down=[self.images['ghost/eaten/down']])
 
+        blink_assets = [self.images['ghost/scared_1'], self.images['ghost/scared_3']]
 
+        return blinky_assets, pinky_assets, inky_assets, clyde_assets, frightened_assets, eaten_assets, blink_assets
 
+    def __ghost_asset(self, name):
+        return Asset(left=[self.images[f'ghost/{name}/left1'], self.images[f'ghost/{name}/left2']],
+                     right=[self.images[f'ghost/{name}/right1'], self.images[f'ghost/{name}/right2']],
+                     up=[self.images[f'ghost/{name}/up1'], self.images[f'ghost/{name}/up2']],
+                     down=[self.images[f'ghost/{name}/down1'], self.images[f'ghost/{name}/down2']])
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from model.board_definition import BoardDefinition
+from model.level_config import LevelConfig
+from model.pellets import Pellets
+from settings import DEFAULT_LEVEL, FPS, LEVEL_CACHE
+
+# A level file has "key: value" lines, then a "board:" line followed by one line per board row holding a digit
+# per cell, the BoardStructure values. Positions are "column row" of a tile, # starts a comment.
+# Changing how levels are compiled needs a new version, so that older compiled levels are not used anymore.
+LEVEL_FORMAT_VERSION = 2
+GHOST_NAMES = ('blinky', 'pinky', 'inky', 'clyde')
+LEVEL_KEYS = ('wall_color', 'gate_color', 'power_up_seconds', 'player', 'house', 'house_exit', 'house_bounds') \
+    + GHOST_NAMES + tuple(f'{name}_corner' for name in GHOST_NAMES)
+# arrays of a compiled level, stored one after the other in a single file that is memory mapped when loaded
+COMPILED_TABLES = ('structure', 'exits', 'junctions', 'walkable', 'dots', 'big_dots')
+TABLE_ALIGNMENT = 8
+
+# hash of a level file -> values and mapped tables of its compiled level, loaded levels are shared by the process
+_compiled = {}
+
+
+def load_level(path=DEFAULT_LEVEL, cache_directory=LEVEL_CACHE) -> LevelConfig:
+    # Loads a level file, through its compiled form kept in cache_directory by hash of the file content. A compiled
+    # level that cannot be read is compiled again, the level file is parsed when the cache cannot be used at all
+    content = Path(path).read_bytes()
+    if cache_directory is None:
+        return create_level(parse_level(content.decode(), path))
+    key = hashlib.sha1(b'%d\n' % LEVEL_FORMAT_VERSION + content).hexdigest()
+    if key not in _compiled:
+        compiled = Path(cache_directory).joinpath(key)
+        loaded = _load_or_remove(compiled) if compiled.exists() else None
+        if loaded is None:
+            values = parse_level(content.decode(), path)
+            try:
+                compile_level(values, compiled)
+            except OSError:
+                return create_level(values)
+            loaded = _load_or_remove(compiled)
+            if loaded is None:
+                return create_level(values)
+        _compiled[key] = loaded
+    values, tables = _compiled[key]
+    # the tables are only read, the pellets eaten while playing are copied from them
+    structure = tables['structure']
+    pellets = Pellets(*structure.shape, tables['dots'], tables['big_dots'])
+    board_definition = BoardDefinition(structure, tables['exits'], tables['junctions'], tables['walkable'], pellets)
+    return create_level(values, board_definition)
+
+
+def parse_level(text: str, source='level') -> dict:
+    # Values of a level file, positions as (column, row) tuples and the board as an int8 array
+    fields = {}
+    rows = None
+    for number, line in enumerate(text.splitlines(), 1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        if rows is not None:
+            if not line.isdigit() or (rows and len(line) != len(rows[0])):
+                raise ValueError(f'{source}:{number}: board rows must be digits, all of the same length')
+            rows.append(line)
+            continue
+        key, separator, value = line.partition(':')
+        key = key.strip()
+        if not separator or (key not in LEVEL_KEYS and key != 'board'):
+            raise ValueError(f'{source}:{number}: expected one of {", ".join(LEVEL_KEYS)} or board')
+        if key == 'board':
+            rows = []
+        else:
+            fields[key] = value.split()
+
+    missing = [key for key in LEVEL_KEYS if key not in fields]
+    if missing or not rows:
+        raise ValueError(f'{source}: missing {", ".join(missing) if missing else "board"}')
+    try:
+        position = {key: tuple(int(number) for number in value) for key, value in fields.items()
+                    if key not in ('wall_color', 'gate_color', 'power_up_seconds')}
+        power_up_seconds = float(fields['power_up_seconds'][0])
+    except ValueError:
+        raise ValueError(f'{source}: positions and power_up_seconds must be numbers') from None
+    first_column, last_column, first_row, last_row = position['house_bounds']
+    return {
+        'wall_color': fields['wall_color'][0],
+        'gate_color': fields['gate_color'][0],
+        'power_up_limit': round(power_up_seconds * FPS),
+        'player_position': position['player'],
+        'ghost_positions': {name: position[name] for name in GHOST_NAMES},
+        'ghost_corners': {name: position[f'{name}_corner'] for name in GHOST_NAMES},
+        'ghost_house_location': position['house'],
+        'ghost_house_exit': position['house_exit'],
+        'ghost_house_bounds': ((first_column, last_column), (first_row, last_row)),
+        'board': np.array([[int(cell) for cell in row] for row in rows], dtype=np.int8),
+    }
+
+
+def format_level(level: LevelConfig) -> str:
+    # Level file of a level, with the board as it is now
+    def position(tile):
+        return f'{tile[0]} {tile[1]}'
+
+    (first_column, last_column), (first_row, last_row) = level.ghost_house_bounds
+    lines = [f'wall_color: {level.wall_color}',
+             f'gate_color: {level.gate_color}',
+             f'power_up_seconds: {level.power_up_limit / FPS:g}',
+             f'player: {position(level.player_position)}']
+    lines += [f'{name}: {position(level.ghost_positions[name])}' for name in GHOST_NAMES]
+    lines += [f'{name}_corner: {position(level.ghost_corners[name])}' for name in GHOST_NAMES]
+    lines += [f'house: {position(level.ghost_house_location)}',
+              f'house_exit: {position(level.ghost_house_exit)}',
+              f'house_bounds: {first_column} {last_column} {first_row} {last_row}',
+              'board:']
+    lines += [''.join(str(cell) for cell in row) for row in level.board_definition.to_array().tolist()]
+    return '\n'.join(lines) + '\n'
+
+
+def create_level(values: dict, board_definition: BoardDefinition = None) -> LevelConfig:
+    if board_definition is None:
+        board_definition = BoardDefinition(values['board'])
+    return LevelConfig(board_definition, values['wall_color'], values['gate_color'], values['power_up_limit'],
+                       player_position=tuple(values['player_position']),
+                       ghost_positions={name: tuple(tile) for name, tile in values['ghost_positions'].items()},
+                       ghost_corners={name: tuple(tile) for name, tile in values['ghost_corners'].items()},
+                       ghost_house_location=tuple(values['ghost_house_location']),
+                       ghost_house_exit=tuple(values['ghost_house_exit']),
+                       ghost_house_bounds=tuple(tuple(bounds) for bounds in values['ghost_house_bounds']))
+
+
+def compile_level(values: dict, directory: Path):
+    # Writes the structure, the pellets and the tables derived from them to tables.bin, the other values and the
+    # layout of the tables to level.json. The files are written next to directory first, so that a half written
+    # level is never read.
+    board_definition = BoardDefinition(values['board'])
+    pellets = board_definition.pellets
+    tables = {'structure': board_definition.structure, 'exits': board_definition.exits,
+              'junctions': board_definition.junctions, 'walkable': board_definition.walkable,
+              'dots': np.frombuffer(pellets.initial_dots, dtype=np.uint8),
+              'big_dots': np.frombuffer(pellets.initial_big_dots, dtype=np.uint8)}
+    temporary = directory.with_name(f'{directory.name}.{os.getpid()}.tmp')
+    temporary.mkdir(parents=True, exist_ok=True)
+    layout = {}
+    with open(temporary.joinpath('tables.bin'), 'wb') as tables_file:
+        for name in COMPILED_TABLES:
+            table = np.ascontiguousarray(tables[name])
+            tables_file.write(bytes(-tables_file.tell() % TABLE_ALIGNMENT))
+            layout[name] = {'offset': tables_file.tell(), 'dtype': table.dtype.str, 'shape': table.shape}
+            tables_file.write(table.tobytes())
+    with open(temporary.joinpath('level.json'), 'w') as info_file:
+        json.dump({'values': {key: value for key, value in values.items() if key != 'board'}, 'tables': layout},
+                  info_file)
+    try:
+        os.replace(temporary, directory)
+    except OSError:
+        # compiled by another process in the meantime
+        shutil.rmtree(temporary, ignore_errors=True)
+
+
+def _load_or_remove(directory: Path):
+    # The compiled level of directory, None when it is incomplete or damaged: it is removed then
+    try:
+        return load_compiled_level(directory)
+    except (OSError, ValueError, KeyError, TypeError):
+        shutil.rmtree(directory, ignore_errors=True)
+        return None
+
+
+def load_compiled_level(directory: Path):
+    # Returns the level values and its tables, read only views on the mapped file
+    with open(directory.joinpath('level.json')) as info_file:
+        info = json.load(info_file)
+    mapped = np.memmap(directory.joinpath('tables.bin'), dtype=np.uint8, mode='r')
+    tables = {}
+    for name in COMPILED_TABLES:
+        layout = info['tables'][name]
+        dtype, shape = np.dtype(layout['dtype']), tuple(layout['shape'])
+        end = layout['offset'] + dtype.itemsize * int(np.prod(shape))
+        tables[name] = mapped[layout['offset']:end].view(dtype).reshape(shape)
+    _check_values(info['values'])
+    return info['values'], tables
+
+
+def _check_values(values: dict):
+    # Raises ValueError when the values of a compiled level are not the ones parse_level gives, so that a damaged
+    # level.json is compiled again instead of failing once the level is created
+    def is_pair(value):
+        return isinstance(value, list) and len(value) == 2 and all(type(k) is int for k in value)
+
+    pairs = [values['player_position'], values['ghost_house_location'], values['ghost_house_exit']]
+    if not isinstance(values['ghost_house_bounds'], list) or len(values['ghost_house_bounds']) != 2:
+        raise ValueError('bad ghost house bounds')
+    pairs += values['ghost_house_bounds']
+    for key in ('ghost_positions', 'ghost_corners'):
+        if not isinstance(values[key], dict) or sorted(values[key]) != sorted(GHOST_NAMES):
+            raise ValueError(f'bad {key}')
+        pairs += values[key].values()
+    if not all(is_pair(pair) for pair in pairs) or type(values['power_up_limit']) is not int \
+            or not isinstance(values['wall_color'], str) or not isinstance(values['gate_color'], str):
+        raise ValueError('bad level values')
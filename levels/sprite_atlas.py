@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+import json
+import math
+import os
+from pathlib import Path
+
+import pygame
+
+from draw.sprite_cache import convert_image
+from levels.level_loader import GHOST_NAMES
+from settings import DEATH_ANIMATION_FRAMES, SPRITE_SIZE
+
+ATLAS_IMAGE = Path('assets/atlas.png')
+ATLAS_INDEX = Path('assets/atlas.json')
+
+GHOST_DIRECTIONS = ('left', 'right', 'up', 'down')
+
+
+def _build_sprite_sources():
+    sources = {}
+    for i in range(1, 5):
+        sources[f'player/{i}'] = Path(f'assets/player_images/{i}.png')
+    for i in range(1, DEATH_ANIMATION_FRAMES + 1):
+        sources[f'player/death/{i}'] = Path(f'assets/player_images/death_animation/{i}.png')
+    for name in GHOST_NAMES:
+        for direction in GHOST_DIRECTIONS:
+            for i in range(1, 3):
+                sources[f'ghost/{name}/{direction}{i}'] = Path(f'assets/ghost_images/{name}/{direction}{i}.png')
+    for direction in GHOST_DIRECTIONS:
+        sources[f'ghost/eaten/{direction}'] = Path(f'assets/ghost_images/eaten/eyes_{direction}.png')
+    for i in range(1, 4):
+        sources[f'ghost/scared_{i}'] = Path(f'assets/ghost_images/scared_{i}.png')
+    return sources
+
+
+# Every sprite used by the game, by atlas key
+SPRITE_SOURCES = _build_sprite_sources()
+
+
+def bake_atlas(image_path=ATLAS_IMAGE, index_path=ATLAS_INDEX):
+    # Packs all sprites, scaled to SPRITE_SIZE, into a single image plus an index of their rectangles
+    width, height = SPRITE_SIZE
+    columns = math.ceil(math.sqrt(len(SPRITE_SOURCES)))
+    rows = math.ceil(len(SPRITE_SOURCES) / columns)
+    atlas = pygame.Surface((columns * width, rows * height), pygame.SRCALPHA)
+    rects = {}
+    for n, (key, source) in enumerate(SPRITE_SOURCES.items()):
+        x, y = (n % columns) * width, (n // columns) * height
+        atlas.blit(_load_scaled(source), (x, y))
+        rects[key] = [x, y, width, height]
+    pygame.image.save(atlas, str(image_path))
+    with open(index_path, 'w') as index_file:
+        json.dump({'sprite_size': list(SPRITE_SIZE), 'sprites': rects}, index_file, indent=1)
+
+
+def load_sprite_images() -> dict:
+    # Returns sprite surfaces by atlas key, from the baked atlas when it is up to date or from loose images
+    index = _read_fresh_index(ATLAS_IMAGE, ATLAS_INDEX)
+    if index is None:
+        return {key: _load_scaled(source) for key, source in SPRITE_SOURCES.items()}
+    atlas = convert_image(pygame.image.load(str(ATLAS_IMAGE)))
+    return {key: atlas.subsurface(pygame.Rect(rect)) for key, rect in index['sprites'].items()}
+
+
+def _load_scaled(source: Path):
+    return pygame.transform.scale(pygame.image.load(str(source)), SPRITE_SIZE)
+
+
+def _read_fresh_index(image_path: Path, index_path: Path):
+    if not image_path.exists() or not index_path.exists():
+        return None
+    baked_at = min(os.path.getmtime(image_path), os.path.getmtime(index_path))
+    if any(os.path.getmtime(source) > baked_at for source in SPRITE_SOURCES.values()):
+        return None
+    try:
+        with open(index_path) as index_file:
+            index = json.load(index_file)
+    except (OSError, ValueError):
+        return None
+    if tuple(index.get('sprite_size', ())) != tuple(SPRITE_SIZE) or index.get('sprites', {}).keys() != SPRITE_SOURCES.keys():
+        return None
+    return index
+
+
+if __name__ == '__main__':
+    bake_atlas()
+    print(f'Baked {len(SPRITE_SOURCES)} sprites into {ATLAS_IMAGE} and {ATLAS_INDEX}')
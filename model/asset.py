@@ -1,6 +1,13 @@
+from model.direction import Direction
+
+
 class Asset:
     def __init__(self, left: list, right: list, up: list, down: list):
         self.left = left
         self.right = right
         self.up = up
         self.down = down
+        self.frames = {Direction.LEFT: left, Direction.RIGHT: right, Direction.UP: up, Direction.DOWN: down}
+
+    def get(self, direction: Direction) -> list:
+        return self.frames[direction]
@@ -1,14 +1,98 @@
+import enum
+
 import numpy as np
 from numpy import ndarray
 
+from model.board_structure import BoardStructure
+from model.direction import Direction
+from model.pellets import Pellets
+
+# bit of each direction in an exits table cell
+RIGHT_EXIT = 1 << Direction.RIGHT.value
+LEFT_EXIT = 1 << Direction.LEFT.value
+UP_EXIT = 1 << Direction.UP.value
+DOWN_EXIT = 1 << Direction.DOWN.value
+
 
 class BoardDefinition:
-    def __init__(self, board: ndarray):
+    # board holds BoardStructure values. Walls and gate, which never change while playing, are kept in structure,
+    # dots and big dots in pellets. The tables derived from the board and the pellets can be given when they were
+    # compiled before, see levels/level_loader.py
+    def __init__(self, board: ndarray, exits: ndarray = None, junctions: ndarray = None, walkable: ndarray = None,
+                 pellets: Pellets = None):
         board_size = np.shape(board)
         self.height = board_size[0]
         self.width = board_size[1]
-        self.board = board
+        pellet_tiles = (board == BoardStructure.DOT.value) | (board == BoardStructure.BIG_DOT.value)
+        self.structure = np.where(pellet_tiles, BoardStructure.EMPTY.value, board).astype(np.uint8)
+        # same array as nested lists, for reading single cells
+        self.structure_rows = self.structure.tolist()
+        self.pellets = pellets if pellets is not None else Pellets.from_board(board)
+        self.exits = None
+        # same table as nested lists, reading single cells from them is much faster than from an array
+        self.exit_rows = None
+        # junctions[walker][i, j]: bits of the directions of arrival for which a walker at the center of the tile
+        # can choose between several ways without going back, laid out as exits
+        self.junctions = None
+        self.junction_rows = None
+        # tiles that are not walls, the gate included
+        self.walkable = None
+        if exits is None or junctions is None or walkable is None:
+            self.compile_exits()
+        else:
+            self.__set_tables(exits, junctions, walkable)
 
     def check_coordinate_within(self, i, j):
         return i <= self.height - 1 and j <= self.width - 1
 
+    def to_array(self):
+        # The board as it is now, in the layout it was given
+        return self.structure | self.pellets.to_array()
+
+    def compile_exits(self):
+        # Builds exits[walker][i, j]: the directions a walker can leave tile (i, j) to, as bits.
+        # Only walls and gate change walkability, so it only has to be rebuilt when the structure changes.
+        # Entities probe tiles from -1 to height/width while they go through a tunnel: the table has
+        # one extra row and column at the end for them, tile -1 is reached by negative indexing.
+        rows = np.arange(-2, self.height + 2)
+        columns = np.arange(-2, self.width + 2)
+        cells = self.structure[np.ix_(rows % self.height, columns % self.width)]
+        # cells past the last row or column are open, negative indices wrap around
+        open_cells = (rows > self.height - 1)[:, None] | (columns > self.width - 1)[None, :] \
+            | (cells < BoardStructure.VERTICAL_WALL.value)
+        gate = ~open_cells & (cells == BoardStructure.GATE.value)
+
+        # neighbours of the tiles -1..height, -1..width
+        def around(layer, di, dj):
+            return layer[1 + di:self.height + 3 + di, 1 + dj:self.width + 3 + dj]
+
+        player = (around(open_cells, 0, 1) * RIGHT_EXIT | around(open_cells, 0, -1) * LEFT_EXIT
+                  | around(open_cells, -1, 0) * UP_EXIT | around(open_cells, 1, 0) * DOWN_EXIT)
+        ghost = player | around(gate, -1, 0) * UP_EXIT
+        eaten_ghost = ghost | around(gate, 1, 0) * DOWN_EXIT
+        exits = np.stack([player, ghost, eaten_ghost]).astype(np.uint8)
+        # move tile -1 from the first to the last row and column
+        exits = np.roll(exits, -1, axis=(1, 2))
+
+        junctions = np.zeros_like(exits)
+        for direction, back in ((Direction.RIGHT, LEFT_EXIT), (Direction.LEFT, RIGHT_EXIT),
+                                (Direction.UP, DOWN_EXIT), (Direction.DOWN, UP_EXIT)):
+            ways_forward = exits & ~np.uint8(back)
+            # clears the lowest bit, what remains is not zero with two ways or more
+            junctions |= ((ways_forward & (ways_forward - 1)) != 0) * np.uint8(1 << direction.value)
+        walkable = (self.structure < BoardStructure.VERTICAL_WALL.value) | (self.structure == BoardStructure.GATE.value)
+        self.__set_tables(exits, junctions, walkable)
+
+    def __set_tables(self, exits, junctions, walkable):
+        self.exits = exits
+        self.exit_rows = exits.tolist()
+        self.junctions = junctions
+        self.junction_rows = junctions.tolist()
+        self.walkable = walkable
+
+    class Walker(enum.Enum):
+        PLAYER = 0
+        # ghosts can leave the house through the gate
+        GHOST = 1
+        # eaten ghosts can also enter the house through the gate
+        EATEN_GHOST = 2
@@ -0,0 +1,81 @@
+import math
+
+from settings import DISTANCE_FACTOR
+
+
+def sweeps_overlap(first, second, reach=DISTANCE_FACTOR):
+    # Sweeps are (start x, start y, end x, end y) of two entities moving along straight lines during the same tick.
+    # They overlap when at some moment t in [0, 1] both coordinates of the entities are closer than reach.
+    earliest, latest = -math.inf, math.inf
+    for axis in range(2):
+        distance = first[axis] - second[axis]
+        speed = (first[axis + 2] - first[axis]) - (second[axis + 2] - second[axis])
+        if speed == 0:
+            if abs(distance) >= reach:
+                return False
+        else:
+            low, high = sorted(((-reach - distance) / speed, (reach - distance) / speed))
+            earliest = max(earliest, low)
+            latest = min(latest, high)
+    return earliest < latest and earliest < 1 and latest > 0
+
+
+class CollisionGrid:
+    # Uniform grid of board tiles where each entity is listed in the tiles its movement of the last tick
+    # passes through, so only entities sharing a tile are tested against each other
+
+    def __init__(self, cell_width, cell_height, reach=DISTANCE_FACTOR):
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.reach = reach
+        self.cells = {}
+        # entity -> movement of the last tick and the range of tiles covering it
+        self.sweeps = {}
+        self.covered = {}
+        # entity -> registration number, collisions are reported in this order
+        self.order = {}
+
+    def add(self, entity, position):
+        self.order[entity] = len(self.order)
+        self.move(entity, position, position)
+
+    def move(self, entity, start, end):
+        if abs(end[0] - start[0]) > self.cell_width or abs(end[1] - start[1]) > self.cell_height:
+            # teleported through a tunnel or back to its start position, it did not cross the tiles in between
+            start = end
+        sweep = (start[0], start[1], end[0], end[1])
+        self.sweeps[entity] = sweep
+        covered = self.__get_covered_cells(sweep)
+        previous = self.covered.get(entity)
+        if covered == previous:
+            return
+        if previous is not None:
+            for cell in self.__cells_in(previous):
+                del self.cells[cell][entity]
+        for cell in self.__cells_in(covered):
+            self.cells.setdefault(cell, {})[entity] = None
+        self.covered[entity] = covered
+
+    def find_collisions(self, entity):
+        # All entities that touched entity during the last tick, in registration order
+        sweep = self.sweeps[entity]
+        candidates = set()
+        for cell in self.__cells_in(self.covered[entity]):
+            candidates.update(self.cells[cell])
+        candidates.discard(entity)
+        hits = [other for other in candidates if sweeps_overlap(sweep, self.sweeps[other], self.reach)]
+        return sorted(hits, key=self.order.get)
+
+    def __get_covered_cells(self, sweep):
+        # tiles touched by the bounding box of the movement grown by reach
+        left = min(sweep[0], sweep[2]) - self.reach
+        right = max(sweep[0], sweep[2]) + self.reach
+        top = min(sweep[1], sweep[3]) - self.reach
+        bottom = max(sweep[1], sweep[3]) + self.reach
+        return (math.floor(top / self.cell_height), math.floor(bottom / self.cell_height),
+                math.floor(left / self.cell_width), math.floor(right / self.cell_width))
+
+    @staticmethod
+    def __cells_in(covered):
+        first_i, last_i, first_j, last_j = covered
+        return [(i, j) for i in range(first_i, last_i + 1) for j in range(first_j, last_j + 1)]
@@ -1,8 +1,7 @@
 from typing import Tuple
 
-import pygame
-
 from settings import *
+from model.board_definition import LEFT_EXIT, RIGHT_EXIT, UP_EXIT, DOWN_EXIT
 from model.direction import Direction
 from model.space_params.space_params import SpaceParams
 from model.turns import Turns
@@ -21,23 +20,39 @@ class Entity:
         self.top_left_y = self.location_y - SPRITE_SIZE[1] // 2
 
         self.initial_pos = self.location_x, self.location_y
+        # sprite position at the end of the previous tick, to draw the entity between two ticks
+        self.previous_top_left = self.top_left_x, self.top_left_y
 
         self.velocity = velocity
         self.direction = Direction.RIGHT
         self.turns = turns
 
-        self.board = space_params.board_definition.board
-        self.sfx = self.SoundEffects()
-
     def reset_position(self):
         self.location_x = self.initial_pos[0]
         self.location_y = self.initial_pos[1]
         self.top_left_x = self.location_x - SPRITE_SIZE[0] // 2
         self.top_left_y = self.location_y - SPRITE_SIZE[1] // 2
 
-    def render(self, screen):
+    def render(self, screen, alpha=1.0, offset=(0, 0)):
         pass
 
+    def save_position(self):
+        self.previous_top_left = self.top_left_x, self.top_left_y
+
+    def get_render_position(self, alpha, offset=(0, 0)):
+        # Sprite position at fraction alpha of the way from the previous tick to the current one,
+        # offset is added to get it on screen when the view scrolls
+        previous_x, previous_y = self.previous_top_left
+        if abs(self.top_left_x - previous_x) > self.space_params.tile_width \
+                or abs(self.top_left_y - previous_y) > self.space_params.tile_height:
+            # teleported, there is nothing in between
+            return self.top_left_x + offset[0], self.top_left_y + offset[1]
+        return round(previous_x + (self.top_left_x - previous_x) * alpha) + offset[0], \
+            round(previous_y + (self.top_left_y - previous_y) * alpha) + offset[1]
+
+    def get_tile(self):
+        return self.location_y // self.space_params.tile_height, self.location_x // self.space_params.tile_width
+
     def _move_right(self):
         self.location_x += self.velocity
         self.top_left_x += self.velocity
@@ -57,6 +72,21 @@ class Entity:
     def _check_borders_ahead(self):
         pass
 
+    def _update_turns(self, walker):
+        # Permits or prohibits to turn in certain direction depending on the exits of the tiles around the entity
+        exits = self.space_params.board_definition.exit_rows[walker.value]
+        x = self.location_x
+        y = self.location_y
+        i = y // self.space_params.tile_height
+        j = x // self.space_params.tile_width
+        self.turns.left = exits[i][(x + DISTANCE_FACTOR) // self.space_params.tile_width] & LEFT_EXIT != 0
+        self.turns.right = exits[i][(x - DISTANCE_FACTOR) // self.space_params.tile_width] & RIGHT_EXIT != 0
+        self.turns.up = exits[(y + DISTANCE_FACTOR) // self.space_params.tile_height][j] & UP_EXIT != 0
+        self.turns.down = exits[(y - DISTANCE_FACTOR) // self.space_params.tile_height][j] & DOWN_EXIT != 0
+
+    def _can_turn(self, direction: Direction):
+        return (self.turns.right, self.turns.left, self.turns.up, self.turns.down)[direction.value]
+
     def _align_movement_to_cell_center(self, direction_command):
         # Ensures entity moves strictly by cell centers and not blocked in corners.
 
@@ -119,32 +149,8 @@ class Entity:
             self.__teleport(self.top_left_x,
                             (self.space_params.board_definition.height - 1) * self.space_params.tile_height)
 
-    def _is_asle_ahead(self, i, j):
-        if i > self.space_params.board_definition.height - 1 or j > self.space_params.board_definition.width - 1:
-            return True
-        else:
-            return self.board[i][j] < 3
-
     def __teleport(self, x, y):
         self.top_left_x = x
         self.top_left_y = y
         self.location_x = self.top_left_x + SPRITE_SIZE[0] // 2
         self.location_y = self.top_left_y + SPRITE_SIZE[1] // 2
-
-    class SoundEffects:
-        def __init__(self):
-            self.munch_i = False
-            self.ghost_eaten = pygame.mixer.Sound('media/eat_ghost.wav')
-            self.munch = [pygame.mixer.Sound('media/munch_1.wav'), pygame.mixer.Sound('media/munch_2.wav')]
-            self.power_pellet = pygame.mixer.Sound('media/power_pellet.wav')
-            self.retreating = pygame.mixer.Sound('media/retreating.wav')
-            self.pacman_death = pygame.mixer.Sound('media/pacman_death.wav')
-
-        def play_munch(self):
-            if self.munch_i:
-                self.munch[1].play()
-                self.munch_i = False
-            else:
-                self.munch[0].play()
-                self.munch_i = True
-
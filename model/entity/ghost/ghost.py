@@ -2,22 +2,33 @@ import enum
 import math
 from typing import Tuple
 from model.asset import Asset
+from model.board_definition import BoardDefinition
 from model.direction import Direction
 from model.entity.entity import Entity
 from model.entity.player.player import Player
+from model.navigation.distance_fields import DistanceFields
 from model.space_params.space_params import SpaceParams
 from model.turns import Turns
 from settings import *
 
+# directions a ghost can take while moving in a direction, it never turns back by itself
+TURN_CANDIDATES = {
+    Direction.RIGHT: (Direction.RIGHT, Direction.UP, Direction.DOWN),
+    Direction.LEFT: (Direction.LEFT, Direction.UP, Direction.DOWN),
+    Direction.UP: (Direction.RIGHT, Direction.LEFT, Direction.UP),
+    Direction.DOWN: (Direction.RIGHT, Direction.LEFT, Direction.DOWN),
+}
 
 class Ghost(Entity):
 
-    def __init__(self, center_position: Tuple, assets: Asset, frightened_assets: list, eaten_assets: Asset,
+    def __init__(self, kind: str, center_position: Tuple, assets: Asset, frightened_assets: list, eaten_assets: Asset,
                  blink_assets: list, player: Player,
                  turns: Turns, space_params: SpaceParams, home_corner: Tuple, ghost_house_location: Tuple,
-                 ghost_house_exit: Tuple,
+                 ghost_house_exit: Tuple, ghost_house_bounds: Tuple,
                  velocity=DEFAULT_VELOCITY):
         super().__init__(center_position, turns, space_params, velocity)
+        # the targeting strategy of the ghost, see GhostTargeting
+        self.kind = kind
         # sprites
         self.assets = assets
         self.eaten_assets = eaten_assets
@@ -29,14 +40,17 @@ class Ghost(Entity):
         self.home_corner = self.__recalculate_to_screen_coordinates(home_corner)
         self.ghost_house_location = self.__recalculate_to_screen_coordinates(ghost_house_location)
         self.ghost_house_exit = self.__recalculate_to_screen_coordinates(ghost_house_exit)
+        self.ghost_house_bounds = ghost_house_bounds
+        # maze distances used instead of straight line ones when set
+        self.navigation = None
+        # how the ghost walks through the board, updated with its turns
+        self.walker = BoardDefinition.Walker.GHOST
 
         # initial state
         self.direction = Direction.UP
         self.state = self.State.CHASE
         self.set_to_scatter()
         self.runaway = False
-        self.scatter_counter_duration = 0
-        self.enable_scatter_counter = 0
         self.sprite_counter = 0
         self.sprite_index = 0
 
@@ -44,6 +58,13 @@ class Ghost(Entity):
         return board_coordinates[0] * self.space_params.tile_width - self.space_params.tile_width // 2, \
                board_coordinates[1] * self.space_params.tile_height + self.space_params.tile_height // 2
 
+    def use_navigation(self, navigation: DistanceFields):
+        self.navigation = navigation
+        fixed_targets = [self._calc_tile_location(*target)[::-1]
+                         for target in (self.home_corner, self.ghost_house_location, self.ghost_house_exit)]
+        navigation.prepare(BoardDefinition.Walker.GHOST, fixed_targets)
+        navigation.prepare(BoardDefinition.Walker.EATEN_GHOST, fixed_targets)
+
     def reset_position(self):
         self.__set_to_chase()
         super().reset_position()
@@ -51,8 +72,8 @@ class Ghost(Entity):
     def is_in_house(self):
         x = self.location_x // self.space_params.tile_width
         y = self.location_y // self.space_params.tile_height
-        return GHOST_HOUSE_COORDINATES_X[0] <= x <= GHOST_HOUSE_COORDINATES_X[1] \
-            and GHOST_HOUSE_COORDINATES_Y[0] <= y <= GHOST_HOUSE_COORDINATES_Y[1]
+        (first_column, last_column), (first_row, last_row) = self.ghost_house_bounds
+        return first_column <= x <= last_column and first_row <= y <= last_row
 
     def is_frightened(self):
         return self.state == self.State.FRIGHTENED
@@ -86,9 +107,6 @@ class Ghost(Entity):
             self.state = self.State.SCATTER
 
     def set_to_eaten(self):
-        delay = self.sfx.ghost_eaten.get_length()
-        self.sfx.ghost_eaten.play()
-        pygame.time.set_timer(GHOST_EATEN_EVENT, int(delay * 1000), True)
         self.state = self.State.EATEN
         self.velocity = FAST_VELOCITY
 
@@ -99,43 +117,20 @@ class Ghost(Entity):
         if self.sprite_counter % (len(self.assets.left) * GHOST_SPRITE_FREQUENCY) == 0:
             self.sprite_index = 0
 
-    def render(self, screen):
+    def update_animation(self):
         self.__calculate_sprite_index()
 
+    def render(self, screen, alpha=1.0, offset=(0, 0)):
         if self.is_chasing() or self.is_scatter():
-            if self.direction == Direction.LEFT:
-                screen.blit(self.assets.left[self.sprite_index],
-                            (self.top_left_x, self.top_left_y))
-            elif self.direction == Direction.RIGHT:
-                screen.blit(self.assets.right[self.sprite_index],
-                            (self.top_left_x, self.top_left_y))
-            elif self.direction == Direction.UP:
-                screen.blit(self.assets.up[self.sprite_index],
-                            (self.top_left_x, self.top_left_y))
-            elif self.direction == Direction.DOWN:
-                screen.blit(self.assets.down[self.sprite_index],
-                            (self.top_left_x, self.top_left_y))
-
+            sprite = self.assets.get(self.direction)[self.sprite_index]
         elif self.is_frightened():
-            if self.player.powerup_counter < 3 * FPS:
-                screen.blit(self.blink_assets[self.sprite_index],
-                            (self.top_left_x, self.top_left_y))
+            if self.player.powerup_ending:
+                sprite = self.blink_assets[self.sprite_index]
             else:
-                screen.blit(self.frightened_assets[self.sprite_index],
-                                (self.top_left_x, self.top_left_y))
-        elif self.is_eaten():
-            if self.direction == Direction.LEFT:
-                screen.blit(self.eaten_assets.left[0],
-                            (self.top_left_x, self.top_left_y))
-            elif self.direction == Direction.RIGHT:
-                screen.blit(self.eaten_assets.right[0],
-                            (self.top_left_x, self.top_left_y))
-            elif self.direction == Direction.UP:
-                screen.blit(self.eaten_assets.up[0],
-                            (self.top_left_x, self.top_left_y))
-            elif self.direction == Direction.DOWN:
-                screen.blit(self.eaten_assets.down[0],
-                            (self.top_left_x, self.top_left_y))
+                sprite = self.frightened_assets[self.sprite_index]
+        else:
+            sprite = self.eaten_assets.get(self.direction)[0]
+        return screen.blit(sprite, self.get_render_position(alpha, offset))
 
     def change_direction_to_opposite(self):
         if self.direction == Direction.LEFT:
@@ -147,51 +142,52 @@ class Ghost(Entity):
         elif self.direction == Direction.UP:
             self._move(Direction.DOWN)
 
-    def follow_target(self):
+    def follow_target(self, target=None):
+        # target is the screen position the ghost heads for, needed only when it is_at_junction()
         self._check_borders_ahead()
         if self.is_eaten() and self.is_in_house():
             self.__set_to_chase()
 
-        if self.is_scatter():
-            if self.scatter_counter_duration == SCATTER_DISABLE_TRIGGER:
-                self.set_to_chase()
-                self.scatter_counter_duration = 0
-            else:
-                self.scatter_counter_duration += 1
-
-        if self.enable_scatter_counter == SCATTER_ENABLE_TRIGGER and self.is_chasing():
-            self.set_to_scatter()
-            self.enable_scatter_counter = 0
-        else:
-            self.enable_scatter_counter += 1
-
         if self.is_frightened():
             self.runaway = True
         else:
             self.runaway = False
 
-        right_distance = self.calc_distance(self.location_x + self.space_params.tile_width, self.location_y)
-        left_distance = self.calc_distance(self.location_x - self.space_params.tile_width, self.location_y)
-        up_distance = self.calc_distance(self.location_x, self.location_y - self.space_params.tile_height)
-        down_distance = self.calc_distance(self.location_x, self.location_y + self.space_params.tile_height)
-
-        right = right_distance, Direction.RIGHT, self.turns.right
-        left = left_distance, Direction.LEFT, self.turns.left
-        up = up_distance, Direction.UP, self.turns.up
-        down = down_distance, Direction.DOWN, self.turns.down
-
-        if self.direction == Direction.RIGHT:
-            next_turn = self.calc_next_turn([right, up, down])
-            self._move(next_turn)
-        elif self.direction == Direction.LEFT:
-            next_turn = self.calc_next_turn([left, up, down])
-            self._move(next_turn)
-        elif self.direction == Direction.UP:
-            next_turn = self.calc_next_turn([right, left, up])
-            self._move(next_turn)
-        elif self.direction == Direction.DOWN:
-            next_turn = self.calc_next_turn([right, left, down])
-            self._move(next_turn)
+        candidates = TURN_CANDIDATES[self.direction]
+        if target is not None:
+            # the target only matters where the ghost can choose between several ways
+            target = self._calc_tile_location(*target)
+            field = self.__get_distance_field(target)
+            next_turn = self.calc_next_turn([(self.__calc_turn_distance(turn, target, field), turn, self._can_turn(turn))
+                                             for turn in candidates])
+        else:
+            next_turn = next((turn for turn in candidates if self._can_turn(turn)), None)
+        self._move(next_turn)
+
+    def __get_distance_field(self, target):
+        if self.navigation is None:
+            return None
+        walker = BoardDefinition.Walker.EATEN_GHOST if self.is_eaten() else BoardDefinition.Walker.GHOST
+        return self.navigation.get_field(walker, target[::-1])
+
+    def is_at_junction(self):
+        # Turns are taken at cell centers only, where the turns of the ghost are the exits of its tile.
+        # Asked before the ghost moves, so the walker comes from its state rather than from its last move
+        if not self._is_at_center(self.space_params.tile_width, self.space_params.tile_height):
+            return False
+        walker = BoardDefinition.Walker.EATEN_GHOST if self.is_eaten() else BoardDefinition.Walker.GHOST
+        i, j = self.get_tile()
+        return self.space_params.board_definition.junction_rows[walker.value][i][j] & (1 << self.direction.value) != 0
+
+    def __calc_turn_distance(self, turn: Direction, target, field):
+        if turn == Direction.RIGHT:
+            return self.calc_distance(self.location_x + self.space_params.tile_width, self.location_y, target, field)
+        elif turn == Direction.LEFT:
+            return self.calc_distance(self.location_x - self.space_params.tile_width, self.location_y, target, field)
+        elif turn == Direction.UP:
+            return self.calc_distance(self.location_x, self.location_y - self.space_params.tile_height, target, field)
+        else:
+            return self.calc_distance(self.location_x, self.location_y + self.space_params.tile_height, target, field)
 
     def calc_next_turn(self, possible_decisions):
         prioritized = sorted(possible_decisions, key=lambda x: x[0], reverse=self.runaway)
@@ -199,18 +195,17 @@ class Ghost(Entity):
             if prioritized[i][2]:
                 return prioritized[i][1]
 
-    def calc_distance(self, x, y):
-        target = self.target()
-        target = self._calc_tile_location(target[0], target[1])
+    def calc_distance(self, x, y, target, field=None):
+        # target is a tile location.
+        # With a distance field of the navigation the maze distance is returned instead of the straight line one
         self_location = self._calc_tile_location(x, y)
+        if field is not None:
+            return self.navigation.read(field, self_location[::-1])
         return math.pow((target[0] - self_location[0]), 2) + math.pow((target[1] - self_location[1]), 2)
 
     def _calc_tile_location(self, x, y):
         return x // self.space_params.tile_width, y // self.space_params.tile_height
 
-    def target(self) -> Tuple:
-        pass
-
     def _move(self, direction_command: Direction):
         self._teleport_if_board_limit_reached()
         self._align_movement_to_cell_center(direction_command)
@@ -239,36 +234,8 @@ class Ghost(Entity):
                 self._snap_to_center(self.space_params.tile_width, self.space_params.tile_height)
 
     def _check_borders_ahead(self):
-        # Checks next cell based on current entity position and direction and
-        # permits or prohibits to turn in certain direction depending on obstacles ahead
-        x = self.location_x
-        y = self.location_y
-        i = (y // self.space_params.tile_height)
-        j = ((x + DISTANCE_FACTOR) // self.space_params.tile_width) - 1
-        if self._is_asle_ahead(i, j):
-            self.turns.left = True
-        else:
-            self.turns.left = False
-
-        i = (y // self.space_params.tile_height)
-        j = ((x - DISTANCE_FACTOR) // self.space_params.tile_width) + 1
-        if self._is_asle_ahead(i, j):
-            self.turns.right = True
-        else:
-            self.turns.right = False
-        i = ((y + DISTANCE_FACTOR) // self.space_params.tile_height) - 1
-        j = (x // self.space_params.tile_width)
-        if self._is_asle_ahead(i, j) or self.board[i][j] == 9:
-            self.turns.up = True
-        else:
-            self.turns.up = False
-
-        i = ((y - DISTANCE_FACTOR) // self.space_params.tile_height) + 1
-        j = (x // self.space_params.tile_width)
-        if self._is_asle_ahead(i, j) or (self.is_eaten() and self.board[i][j] == 9):
-            self.turns.down = True
-        else:
-            self.turns.down = False
+        self.walker = BoardDefinition.Walker.EATEN_GHOST if self.is_eaten() else BoardDefinition.Walker.GHOST
+        self._update_turns(self.walker)
 
     class State(enum.Enum):
         # when a ghost is chasing pacman
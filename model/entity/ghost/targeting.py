@@ -0,0 +1,132 @@
+import numpy as np
+from numpy import ndarray
+
+from model.direction import Direction
+from model.entity.ghost.ghost import Ghost
+
+# direction value -> tile offset of the position ahead of the player, up also goes left as in the original game
+AHEAD_X = np.array([{Direction.RIGHT: 1, Direction.LEFT: -1, Direction.UP: -1}.get(direction, 0)
+                    for direction in Direction])
+AHEAD_Y = np.array([{Direction.UP: -1, Direction.DOWN: 1}.get(direction, 0) for direction in Direction])
+EATEN, SCATTER = Ghost.State.EATEN.value, Ghost.State.SCATTER.value
+
+
+class TargetingSnapshot:
+    # The player and the ghosts as arrays, taken once per tick before any ghost moves. Rows are games, a single one
+    # for GameEngine, columns are ghosts: the player arrays have one column, the ghost arrays one per ghost.
+
+    def __init__(self, player_x: ndarray, player_y: ndarray, player_direction: ndarray, ghost_x: ndarray,
+                 ghost_y: ndarray, ghost_state: ndarray):
+        self.player_x = player_x
+        self.player_y = player_y
+        # Direction values
+        self.player_direction = player_direction
+        self.ghost_x = ghost_x
+        self.ghost_y = ghost_y
+        # Ghost.State values
+        self.ghost_state = ghost_state
+
+
+class GhostTargeting:
+    # Screen positions the ghosts head for. Every kind of ghost has a strategy giving the target of its ghosts when
+    # they chase pacman or run away from him; the rules shared by all ghosts (leave the house, go back to it once
+    # eaten, go to the home corner in scatter mode) are applied over them. A strategy is called once per tick for
+    # all the ghosts of its kind, strategy(targeting, snapshot, columns) returns the x and y arrays of the targets of
+    # the ghost columns, broadcast against (games, len(columns)).
+    __strategies = {}
+
+    def __init__(self, kinds, home_corners, ghost_house_location, ghost_house_exit, ghost_house_bounds, tile_width,
+                 tile_height):
+        self.kinds = list(kinds)
+        missing = [kind for kind in self.kinds if kind not in self.__strategies]
+        if missing:
+            raise ValueError(f'no targeting strategy for ghost kind {", ".join(missing)}')
+        # kind -> columns of the ghosts of the kind, a slice when they follow each other as it is faster to index
+        self.columns = {kind: self.__to_index([k for k, other in enumerate(self.kinds) if other == kind])
+                        for kind in dict.fromkeys(self.kinds)}
+        # screen positions, the home corners have a row per ghost
+        self.home_corners = np.array(home_corners).reshape(len(self.kinds), 2)
+        self.ghost_house_location = tuple(ghost_house_location)
+        self.ghost_house_exit = tuple(ghost_house_exit)
+        self.ghost_house_bounds = ghost_house_bounds
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+
+    @staticmethod
+    def __to_index(columns):
+        if columns == list(range(columns[0], columns[-1] + 1)):
+            return slice(columns[0], columns[-1] + 1)
+        return np.array(columns)
+
+    @classmethod
+    def register(cls, kind: str, strategy):
+        # New kinds of ghosts only need a strategy, registered before the engine playing them is created
+        cls.__strategies[kind] = strategy
+
+    def find(self, kind: str):
+        # column of the first ghost of kind, None when there is none
+        columns = self.columns.get(kind)
+        if columns is None:
+            return None
+        return columns.start if isinstance(columns, slice) else int(columns[0])
+
+    def evaluate(self, snapshot: TargetingSnapshot):
+        # x and y arrays of the targets of every ghost of every game
+        chase_x = np.empty(snapshot.ghost_x.shape, dtype=np.int64)
+        chase_y = np.empty(snapshot.ghost_y.shape, dtype=np.int64)
+        for kind, columns in self.columns.items():
+            chase_x[:, columns], chase_y[:, columns] = self.__strategies[kind](self, snapshot, columns)
+
+        state = snapshot.ghost_state
+        eaten, scatter = state == EATEN, state == SCATTER
+        in_house = self.is_in_house(snapshot.ghost_x, snapshot.ghost_y)
+        target_x = np.where(eaten, self.ghost_house_location[0],
+                            np.where(scatter, self.home_corners[:, 0], chase_x))
+        target_y = np.where(eaten, self.ghost_house_location[1],
+                            np.where(scatter, self.home_corners[:, 1], chase_y))
+        return np.where(in_house, self.ghost_house_exit[0], target_x), \
+            np.where(in_house, self.ghost_house_exit[1], target_y)
+
+    def is_in_house(self, x, y):
+        i, j = y // self.tile_height, x // self.tile_width
+        (first_column, last_column), (first_row, last_row) = self.ghost_house_bounds
+        return (first_column <= j) & (j <= last_column) & (first_row <= i) & (i <= last_row)
+
+    def ahead_of_player(self, snapshot: TargetingSnapshot, tiles):
+        # The position tiles ahead of the player
+        direction = snapshot.player_direction
+        return snapshot.player_x + AHEAD_X[direction] * (tiles * self.tile_width), \
+            snapshot.player_y + AHEAD_Y[direction] * (tiles * self.tile_height)
+
+
+def chase_player(targeting: GhostTargeting, snapshot: TargetingSnapshot, columns):
+    return snapshot.player_x, snapshot.player_y
+
+
+def ambush_player(targeting: GhostTargeting, snapshot: TargetingSnapshot, columns):
+    return targeting.ahead_of_player(snapshot, 4)
+
+
+def flank_player(targeting: GhostTargeting, snapshot: TargetingSnapshot, columns):
+    # The point two tiles ahead of the player, mirrored around blinky
+    middle_x, middle_y = targeting.ahead_of_player(snapshot, 2)
+    partner = targeting.find('blinky')
+    if partner is None:
+        return middle_x, middle_y
+    partner_x, partner_y = snapshot.ghost_x[:, partner:partner + 1], snapshot.ghost_y[:, partner:partner + 1]
+    return 2 * partner_x - middle_x, 2 * partner_y - middle_y
+
+
+def keep_distance(targeting: GhostTargeting, snapshot: TargetingSnapshot, columns):
+    # The player while further than 8 tiles away, the home corner when closer
+    x, y = snapshot.ghost_x[:, columns], snapshot.ghost_y[:, columns]
+    far = (snapshot.player_x // targeting.tile_width - x // targeting.tile_width) ** 2 + \
+          (snapshot.player_y // targeting.tile_height - y // targeting.tile_height) ** 2 > 64
+    return np.where(far, snapshot.player_x, targeting.home_corners[columns, 0]), \
+        np.where(far, snapshot.player_y, targeting.home_corners[columns, 1])
+
+
+GhostTargeting.register('blinky', chase_player)
+GhostTargeting.register('pinky', ambush_player)
+GhostTargeting.register('inky', flank_player)
+GhostTargeting.register('clyde', keep_distance)
@@ -0,0 +1,15 @@
+import enum
+
+
+class GameEvent(enum.Enum):
+    DOT_EATEN = 0
+    POWER_PELLET_EATEN = 1
+    GHOST_EATEN = 2
+    PLAYER_EATEN = 3
+    GAME_OVER = 4
+    # the freeze after pacman was caught is over, the death animation starts
+    PLAYER_DYING = 5
+    # every pellet was eaten, they are all back for the next round
+    LEVEL_COMPLETE = 6
+    # the game starts over on the same engine, see GameEngine.reset()
+    GAME_RESET = 7
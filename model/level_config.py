@@ -3,9 +3,20 @@ from model.board_definition import BoardDefinition
 
 class LevelConfig:
 
-    def __init__(self, board_definition: BoardDefinition, wall_color: str, gate_color: str, power_up_limit):
+    def __init__(self, board_definition: BoardDefinition, wall_color: str, gate_color: str, power_up_limit,
+                 player_position, ghost_positions: dict, ghost_corners: dict, ghost_house_location, ghost_house_exit,
+                 ghost_house_bounds):
         self.board_definition = board_definition
         self.wall_color = wall_color
         self.gate_color = gate_color
         self.score = 0
         self.power_up_limit = power_up_limit
+        # positions are (column, row) of board tiles, ghosts are known by name
+        self.player_position = player_position
+        self.ghost_positions = ghost_positions
+        # targets of the ghosts in scatter mode
+        self.ghost_corners = ghost_corners
+        self.ghost_house_location = ghost_house_location
+        self.ghost_house_exit = ghost_house_exit
+        # ((first column, last column), (first row, last row)) of the tiles inside the ghost house
+        self.ghost_house_bounds = ghost_house_bounds
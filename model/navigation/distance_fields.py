@@ -0,0 +1,126 @@
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from model.board_definition import BoardDefinition, DOWN_EXIT, LEFT_EXIT, RIGHT_EXIT, UP_EXIT
+from settings import NAVIGATION_ALL_PAIRS_TILES, NAVIGATION_CACHE_BYTES
+
+UNREACHABLE = 1 << 20
+FIELD_TYPE = np.int32
+
+# (exit bit, row offset, column offset) of the tile that reaches a tile by leaving in the direction of the bit
+PREDECESSORS = ((RIGHT_EXIT, 0, -1), (LEFT_EXIT, 0, 1), (UP_EXIT, 1, 0), (DOWN_EXIT, -1, 0))
+
+
+class DistanceFields:
+    # Maze distances from every tile to a target tile, found by a breadth first search over the exits
+    # of the board. Fields of fixed targets are kept for good, the others in an LRU cache holding as many fields
+    # as fit in cache_bytes.
+    # Walls and gate do not change while playing, so levels with the same layout share their fields.
+    __shared = {}
+
+    def __init__(self, board_definition: BoardDefinition, cache_bytes=NAVIGATION_CACHE_BYTES,
+                 all_pairs_tiles=NAVIGATION_ALL_PAIRS_TILES):
+        self.height = board_definition.height
+        self.width = board_definition.width
+        self.cache_size = max(1, cache_bytes // (self.height * self.width * np.dtype(FIELD_TYPE).itemsize))
+        self.fixed = {}
+        self.cache = OrderedDict()
+        self.walkable_tiles = [(int(i), int(j)) for i, j in zip(*np.nonzero(board_definition.walkable))]
+        # tile index -> index of the closest tile a ghost can stand on, targets inside walls are replaced by it
+        self.nearest_walkable = self.__find_nearest_walkable()
+        self.predecessors = [self.__find_predecessors(board_definition.exit_rows[walker.value])
+                             for walker in BoardDefinition.Walker]
+        if self.height * self.width <= all_pairs_tiles:
+            for walker in BoardDefinition.Walker:
+                self.prepare(walker, self.walkable_tiles)
+
+    @classmethod
+    def shared(cls, board_definition: BoardDefinition):
+        structure = board_definition.structure
+        key = (structure.shape, structure.tobytes())
+        if key not in cls.__shared:
+            cls.__shared[key] = cls(board_definition)
+        return cls.__shared[key]
+
+    def prepare(self, walker: BoardDefinition.Walker, tiles):
+        # Builds the fields of targets known in advance, they are never evicted
+        for tile in tiles:
+            key = (walker.value, self.__clamp(tile))
+            if key not in self.fixed:
+                field = self.cache.pop(key, None)
+                self.fixed[key] = field if field is not None else self.__build_field(walker, key[1])
+
+    def distance(self, walker: BoardDefinition.Walker, target, tile):
+        return self.read(self.get_field(walker, target), tile)
+
+    def read(self, field, tile):
+        # Number of moves from tile to the target of field, tiles out of the board are taken from the opposite side
+        return int(field[(tile[0] % self.height) * self.width + tile[1] % self.width])
+
+    def get_field(self, walker: BoardDefinition.Walker, target):
+        # Distances to target of all tiles, row after row
+        key = (walker.value, self.__clamp(target))
+        field = self.fixed.get(key)
+        if field is not None:
+            return field
+        field = self.cache.get(key)
+        if field is not None:
+            self.cache.move_to_end(key)
+            return field
+        field = self.__build_field(walker, key[1])
+        self.cache[key] = field
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return field
+
+    def __clamp(self, tile):
+        i = min(max(int(tile[0]), 0), self.height - 1)
+        j = min(max(int(tile[1]), 0), self.width - 1)
+        return divmod(int(self.nearest_walkable[i * self.width + j]), self.width)
+
+    def __find_nearest_walkable(self):
+        # Breadth first search from all walkable tiles at once over the grid, walls included and without wrapping:
+        # each tile gets the walkable tile fewest steps away
+        nearest = [-1] * (self.height * self.width)
+        queue = deque(i * self.width + j for i, j in self.walkable_tiles)
+        for tile in queue:
+            nearest[tile] = tile
+        while queue:
+            tile = queue.popleft()
+            i, j = divmod(tile, self.width)
+            for neighbour_i, neighbour_j in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+                if 0 <= neighbour_i < self.height and 0 <= neighbour_j < self.width:
+                    neighbour = neighbour_i * self.width + neighbour_j
+                    if nearest[neighbour] < 0:
+                        nearest[neighbour] = nearest[tile]
+                        queue.append(neighbour)
+        return np.array(nearest, dtype=np.int32)
+
+    def __find_predecessors(self, exits):
+        # predecessors[n]: tiles from which tile n is reached with a single move
+        predecessors = []
+        for i in range(self.height):
+            for j in range(self.width):
+                tiles = []
+                for bit, delta_i, delta_j in PREDECESSORS:
+                    previous_i, previous_j = (i + delta_i) % self.height, (j + delta_j) % self.width
+                    if exits[previous_i][previous_j] & bit:
+                        tiles.append(previous_i * self.width + previous_j)
+                predecessors.append(tiles)
+        return predecessors
+
+    def __build_field(self, walker: BoardDefinition.Walker, target):
+        predecessors = self.predecessors[walker.value]
+        start = target[0] * self.width + target[1]
+        field = [UNREACHABLE] * (self.height * self.width)
+        field[start] = 0
+        queue = deque([start])
+        while queue:
+            tile = queue.popleft()
+            distance = field[tile] + 1
+            for previous in predecessors[tile]:
+                if field[previous] == UNREACHABLE:
+                    field[previous] = distance
+                    queue.append(previous)
+        return np.array(field, dtype=FIELD_TYPE)
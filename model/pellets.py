@@ -0,0 +1,87 @@
+import numpy as np
+from numpy import ndarray
+
+from model.board_structure import BoardStructure
+
+DOT = BoardStructure.DOT.value
+BIG_DOT = BoardStructure.BIG_DOT.value
+EMPTY = BoardStructure.EMPTY.value
+
+
+class Pellets:
+    # Dots and big dots left on a board, as bitsets over the tiles numbered i * width + j (least significant bit
+    # first), with the number of pellets left kept up to date so nothing has to scan the board
+
+    def __init__(self, height, width, dots, big_dots):
+        self.height = height
+        self.width = width
+        # bitsets of the start of the level, restored by reset()
+        self.initial_dots = bytes(dots)
+        self.initial_big_dots = bytes(big_dots)
+        self.dots = bytearray(self.initial_dots)
+        self.big_dots = bytearray(self.initial_big_dots)
+        self.remaining = 0
+        self.reset()
+
+    @classmethod
+    def from_board(cls, board: ndarray):
+        height, width = board.shape
+        return cls(height, width, cls.__pack(board == DOT), cls.__pack(board == BIG_DOT))
+
+    @staticmethod
+    def __pack(tiles: ndarray):
+        return np.packbits(tiles.ravel(), bitorder='little').tobytes()
+
+    def reset(self):
+        self.dots[:] = self.initial_dots
+        self.big_dots[:] = self.initial_big_dots
+        self.remaining = self.__count(self.dots) + self.__count(self.big_dots)
+
+    @staticmethod
+    def __count(bits):
+        return int.from_bytes(bits, 'little').bit_count()
+
+    def get(self, i, j):
+        # BoardStructure value of the pellet on tile (i, j), EMPTY when there is none
+        n = (i % self.height) * self.width + j % self.width
+        bit = 1 << (n & 7)
+        if self.dots[n >> 3] & bit:
+            return DOT
+        if self.big_dots[n >> 3] & bit:
+            return BIG_DOT
+        return EMPTY
+
+    def eat(self, i, j):
+        # Removes the pellet of tile (i, j) and returns what it was, as get() does
+        n = (i % self.height) * self.width + j % self.width
+        byte, bit = n >> 3, 1 << (n & 7)
+        if self.dots[byte] & bit:
+            self.dots[byte] &= ~bit
+            self.remaining -= 1
+            return DOT
+        if self.big_dots[byte] & bit:
+            self.big_dots[byte] &= ~bit
+            self.remaining -= 1
+            return BIG_DOT
+        return EMPTY
+
+    def get_tiles(self, kind=DOT):
+        # (i, j) of the tiles holding a pellet of kind
+        bits = self.dots if kind == DOT else self.big_dots
+        tiles = np.unpackbits(np.frombuffer(bits, dtype=np.uint8), count=self.height * self.width, bitorder='little')
+        return [divmod(int(n), self.width) for n in np.flatnonzero(tiles)]
+
+    def to_array(self):
+        # BoardStructure values of the pellets of every tile, EMPTY where there is none
+        count = self.height * self.width
+        dots = np.unpackbits(np.frombuffer(self.dots, dtype=np.uint8), count=count, bitorder='little')
+        big_dots = np.unpackbits(np.frombuffer(self.big_dots, dtype=np.uint8), count=count, bitorder='little')
+        return (dots * DOT + big_dots * BIG_DOT).astype(np.uint8).reshape(self.height, self.width)
+
+    def save_state(self):
+        return bytes(self.dots), bytes(self.big_dots), self.remaining
+
+    def load_state(self, state):
+        dots, big_dots, self.remaining = state
+        self.dots[:] = dots
+        self.big_dots[:] = big_dots
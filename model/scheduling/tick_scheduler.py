@@ -0,0 +1,42 @@
+import heapq
+
+
+class TickScheduler:
+    # Timers counted in ticks of the simulation clock, kept in a heap ordered by due tick, then by scheduling order.
+    # A timer fires an event, any hashable value: the handlers registered for the event are called with its arguments.
+    # Events and arguments are plain values, so the pending timers are saved with the game state.
+
+    def __init__(self):
+        self.tick = 0
+        # (due tick, scheduling order, event, arguments)
+        self.timers = []
+        self.order = 0
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def schedule(self, delay, event, *arguments):
+        # the timer fires delay ticks from now, at the start of that tick
+        self.order += 1
+        heapq.heappush(self.timers, (self.tick + max(delay, 1), self.order, event, arguments))
+
+    def cancel(self, *events):
+        timers = [timer for timer in self.timers if timer[2] not in events]
+        if len(timers) != len(self.timers):
+            heapq.heapify(timers)
+            self.timers = timers
+
+    def advance(self):
+        self.tick += 1
+        while self.timers and self.timers[0][0] <= self.tick:
+            _, _, event, arguments = heapq.heappop(self.timers)
+            for handler in self.handlers.get(event, ()):
+                handler(*arguments)
+
+    def save_state(self):
+        return self.tick, self.order, list(self.timers)
+
+    def load_state(self, state):
+        self.tick, self.order, timers = state
+        self.timers = list(timers)
@@ -1,42 +1,139 @@
 #!/usr/bin/env python3
 
+import time
+
+# the startup report counts the imports from here
+STARTED = time.perf_counter()
+
+import argparse
 import sys
-from model.board_definition import BoardDefinition
-from model.level_config import LevelConfig
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from audio.audio_player import AudioPlayer
+from audio.sound_bank import SoundBank
+from draw.game_renderer import GameRenderer
+from levels.default_level import create_default_level
 from settings import *
 from levels.level_content_initializer import LevelContentInitializer
+from levels.sprite_atlas import load_sprite_images
 from model.direction import Direction
+from profiling.frame_profiler import FrameProfiler
+from profiling.startup_report import StartupReport
 
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode(RESOLUTION)
+    def __init__(self, startup_report: StartupReport = None):
+        # the report is printed after the first frame when one is given
+        self.print_startup = startup_report is not None
+        self.startup = startup = startup_report or StartupReport()
+        # SDL subsystems are initialized on the main thread only
+        pygame.display.init()
+        pygame.font.init()
+        with startup.phase('audio'):
+            self.__init_audio()
+        # the assets are decoded on other threads while the window comes up, the files are read outside of the GIL
+        with ThreadPoolExecutor(STARTUP_THREADS, thread_name_prefix='startup') as executor:
+            sounds = executor.submit(startup.run, 'sounds', SoundBank.shared().preload)
+            fonts = executor.submit(startup.run, 'fonts', GameRenderer.preload_fonts)
+            level = executor.submit(startup.run, 'level', create_default_level)
+            with startup.phase('window'):
+                self.screen = pygame.display.set_mode(RESOLUTION)
+            # sprites are converted to the format of the window, so they are loaded once it exists
+            images = executor.submit(startup.run, 'sprites', load_sprite_images)
+            for future in (sounds, fonts):
+                future.result()
+            self.images = images.result()
+            first_level = level.result()
         self.timer = pygame.time.Clock()
-        self.game_engine = self.init()
-        self.game_start_sfx = pygame.mixer.Sound('media/game_start.wav')
+        # wall clock time not simulated yet
+        self.accumulator = 0.0
+        self.audio = AudioPlayer(SoundBank.shared())
+        self.profiler = FrameProfiler(enabled=PROFILE)
+        self.recorder = None
+        with startup.phase('game'):
+            self.init(first_level)
+
+    @staticmethod
+    def __init_audio():
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            # no audio device, the game is played without sound
+            pass
+
+    def init(self, level=None):
+        level_init = LevelContentInitializer(level or create_default_level(), self.screen, images=self.images)
+        self.game_engine = level_init.init_game_engine()
+        self.game_engine.profiler = self.profiler
+        self.start_recording()
+        self.renderer = GameRenderer(self.screen, self.game_engine)
+        self.game_engine.add_observer(self.audio)
+        self.draw()
 
-    def init(self):
-        board = BOARD.copy()
-        board_definition = BoardDefinition(board)
-        level_1 = LevelConfig(wall_color='blue', gate_color='white',
-                              board_definition=board_definition, power_up_limit=POWER_UP_LIMIT)
-        level_init = LevelContentInitializer(level_1, self.screen)
-        return level_init.init_game_engine()
+    def restart(self):
+        # a new game on the same engine, renderer and assets
+        self.game_engine.reset()
+        self.start_recording()
+        self.draw()
+
+    def start_recording(self):
+        if RECORD_INPUT:
+            # only needed when recording, not imported on every start
+            from simulation.replay import InputRecorder
+            self.recorder = InputRecorder(self.game_engine)
 
     def update(self):
-        self.timer.tick(FPS)
-        self.game_engine.tick()
-        pygame.display.flip()
+        self.accumulator += self.timer.tick(self.renderer.get_frame_rate()) / 1000
+        with self.profiler.phase('frame'):
+            ticks = 0
+            while self.accumulator >= TICK_DURATION and ticks < MAX_CATCH_UP_TICKS:
+                if self.recorder is not None:
+                    self.recorder.record(self.game_engine)
+                with self.profiler.phase('tick'):
+                    self.game_engine.step()
+                self.accumulator -= TICK_DURATION
+                ticks += 1
+            if ticks == MAX_CATCH_UP_TICKS:
+                self.accumulator %= TICK_DURATION
+            if self.game_engine.game_over:
+                self.save_recording()
+            with self.profiler.phase('render'):
+                self.renderer.render(self.accumulator / TICK_DURATION, ticks)
+            with self.profiler.phase('present'):
+                self.present()
+
+    def present(self):
+        dirty_rects = self.renderer.collect_dirty_rects()
+        if DIRTY_RECTS and dirty_rects is not None:
+            pygame.display.update(dirty_rects)
+        else:
+            pygame.display.flip()
+
+    def save_recording(self):
+        if self.recorder is not None:
+            path = Path(RECORDINGS_DIRECTORY).joinpath(time.strftime('%Y%m%d-%H%M%S') + '.pacrec')
+            self.recorder.recording.save(path)
+            self.recorder = None
+
+    def quit(self):
+        self.save_recording()
+        pygame.quit()
+        sys.exit()
 
     def draw(self):
-        self.screen.fill([12, 2, 25])
+        # scenes drawn once keep their frame, only what changes over it is drawn again
+        if not self.renderer.is_static():
+            self.screen.fill(BACKGROUND_COLOR)
 
     def check_events(self):
-        for event in pygame.event.get():
+        events = pygame.event.get()
+        if not events and self.renderer.get_frame_rate() == 0:
+            # nothing moves on screen, sleep until something happens
+            events = [pygame.event.wait()]
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                self.quit()
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_LEFT:
                     self.game_engine.direction_command = Direction.LEFT
@@ -48,21 +145,29 @@ class Game:
                     self.game_engine.direction_command = Direction.UP
                 if event.key == pygame.K_SPACE:
                     if self.game_engine.game_over:
-                        pygame.init()
-                        self.game_start_sfx.play()
-                        self.game_engine = self.init()
+                        self.audio.play_game_start()
+                        self.restart()
                     else:
                         self.game_engine.pause = not self.game_engine.pause
+                if event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                    self.renderer.request_full_redraw()
+                if event.key == pygame.K_F12:
+                    print(f'Frame trace saved to {self.profiler.export_trace()}')
                 if event.key == pygame.K_ESCAPE:
-                    pygame.quit()
-                    sys.exit()
-            if event.type == GHOST_EATEN_EVENT:
-                self.game_engine.play_ghost_runsaway_sound()
-            if event.type == PLAYER_EATEN_EVENT:
-                self.game_engine.play_player_eaten_sound()
+                    self.quit()
 
     def run(self):
-        self.game_start_sfx.play()
+        self.audio.play_game_start()
+        self.draw()
+        # the first frame is shown right away rather than one frame period later
+        with self.startup.phase('first frame'):
+            self.renderer.render(1.0, 0)
+            self.present()
+        if self.print_startup:
+            print(self.startup.format())
+            self.quit()
+        self.draw()
         while True:
             self.check_events()
             self.update()
@@ -70,5 +175,14 @@ class Game:
 
 
 if __name__ == '__main__':
-    game = Game()
+    parser = argparse.ArgumentParser(description='Pacman')
+    parser.add_argument('--startup-report', action='store_true',
+                        help='print the time of each startup phase up to the first frame, then quit')
+    args = parser.parse_args()
+
+    report = None
+    if args.startup_report:
+        report = StartupReport(STARTED)
+        report.add('imports', STARTED)
+    game = Game(report)
     game.run()
@@ -0,0 +1,88 @@
+import json
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+from settings import PROFILE_HISTORY, PROFILE_TRACE_FILE
+
+
+class _Phase:
+    # Context manager timing one phase, reused for every run of the phase to keep allocations away
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exception):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class _NoPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class FrameProfiler:
+    # Times named phases of the game loop, nested phases are allowed.
+    # The last PROFILE_HISTORY durations of each phase are kept for statistics, the last events for a trace.
+    # While disabled phase() hands out a shared no-op context, so instrumented code costs almost nothing.
+
+    def __init__(self, enabled=False, history=PROFILE_HISTORY):
+        self.enabled = enabled
+        self.history = history
+        self.phases = {}
+        # phase name -> durations in nanoseconds
+        self.samples = {}
+        # (name, start ns, end ns) of the last phases run, for the timeline trace
+        self.events = deque(maxlen=history * 32)
+        self.origin = time.perf_counter_ns()
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NO_PHASE
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = _Phase(self, name)
+        return phase
+
+    def toggle(self):
+        self.enabled = not self.enabled
+
+    def record(self, name, start, end):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.history)
+        samples.append(end - start)
+        self.events.append((name, start, end))
+
+    def get_statistics(self):
+        # phase name -> (p50, p95, p99) in milliseconds, phases in the order they were first seen
+        statistics = {}
+        for name, samples in self.samples.items():
+            p50, p95, p99 = np.percentile(np.fromiter(samples, dtype=np.int64, count=len(samples)), (50, 95, 99))
+            statistics[name] = (p50 / 1e6, p95 / 1e6, p99 / 1e6)
+        return statistics
+
+    def export_trace(self, path=PROFILE_TRACE_FILE):
+        # Writes the recorded events in the Chrome trace event format, readable by chrome://tracing and Perfetto
+        # nested phases end first, sorting by start time and longest first restores the nesting
+        pid = os.getpid()
+        trace_events = [{'name': name, 'ph': 'X', 'pid': pid, 'tid': 1,
+                         'ts': (start - self.origin) / 1000, 'dur': (end - start) / 1000}
+                        for name, start, end in sorted(self.events, key=lambda event: (event[1], -event[2]))]
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, trace_file)
+        return path
@@ -0,0 +1,47 @@
+import threading
+import time
+
+
+class _Phase:
+    def __init__(self, report, name):
+        self.report = report
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception):
+        self.report.add(self.name, self.start)
+        return False
+
+
+class StartupReport:
+    # Phases of the start of the game up to its first frame. Phases run on other threads overlap the ones of the
+    # main thread, each one is kept with the thread it ran on.
+
+    def __init__(self, origin=None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        # (name, thread name, start, end) in seconds of perf_counter
+        self.phases = []
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def add(self, name, start, end=None):
+        self.phases.append((name, threading.current_thread().name, start,
+                            end if end is not None else time.perf_counter()))
+
+    def run(self, name, function, *arguments):
+        # Runs function as a phase, to submit it to an executor
+        with self.phase(name):
+            return function(*arguments)
+
+    def format(self):
+        lines = [f'{"phase":<14}{"thread":<14}{"start":>10}{"duration":>12}']
+        for name, thread, start, end in sorted(self.phases, key=lambda phase: phase[2]):
+            lines.append(f'{name:<14}{thread:<14}{(start - self.origin) * 1000:8.1f}ms{(end - start) * 1000:10.1f}ms')
+        end = max(phase[3] for phase in self.phases) if self.phases else self.origin
+        lines.append(f'{"total":<28}{(end - self.origin) * 1000:8.1f}ms')
+        return '\n'.join(lines)
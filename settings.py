@@ -1,36 +1,61 @@
-import numpy as np
 import pygame
 
 FPS = 60
+# The game logic always runs FPS ticks per second, frames are drawn as often as MAX_RENDER_FPS allows (0 = no limit)
+TICK_DURATION = 1 / FPS
+MAX_RENDER_FPS = 144
+# Frame rates of the scenes where little moves, to spare the CPU of a machine left on these screens. The game logic
+# keeps its rate, a frame rate under FPS / MAX_CATCH_UP_TICKS would slow it down. 0 draws a frame only after some input
+READY_RENDER_FPS = 20
+PAUSED_RENDER_FPS = 12
+GAME_OVER_RENDER_FPS = 0
+# Ticks simulated at most before drawing a frame, a slower machine slows the game down instead of falling behind forever
+MAX_CATCH_UP_TICKS = 5
 DEBUG = False
+# Time the phases of every frame and show their statistics, F3 switches it at run time and F12 saves a trace
+PROFILE = False
+# frames kept by the profiler
+PROFILE_HISTORY = 600
+PROFILE_TRACE_FILE = 'frame_trace.json'
+# Save the input of every game to RECORDINGS_DIRECTORY, to replay it with simulation/replay.py
+RECORD_INPUT = False
+RECORDINGS_DIRECTORY = 'recordings'
+# ticks between two saved game states of a recording, replays can seek from them
+REPLAY_KEYFRAME_INTERVAL = 10 * FPS
+# Threads decoding the assets while the window comes up at startup
+STARTUP_THREADS = 4
+# Present only the screen areas changed in the last frame instead of flipping the whole screen
+DIRTY_RECTS = False
 RESOLUTION = WIDTH, HEIGHT = 900, 990
+# height of the score bar below the maze
+SCORE_SCREEN_OFFSET = 50
 DISTANCE_FACTOR = 10
 
 SPRITE_SIZE = 45, 45
-
-# PLAYER INITIAL POSITION
-PLAYER_POSITION = PLAYER_X, PLAYER_Y = 13, 24
-
-# GHOSTS INITIAL POSITIONS
-BLINKY_POSITION = BLINKY_X, BLINKY_Y = 14, 12
-PINKY_POSITION = PINKY_X, PINKY_Y = 12, 15
-INKY_POSITION = INKY_X, INKY_Y = 14, 15
-CLYDE_POSITION = CLYDE_X, CLYDE_Y = 16, 15
-
-# GHOSTS TARGETS WHEN IN SCATTER MODE
-BLINKY_CORNER = 28, 9
-PINKY_CORNER = 3, 9
-CLYDE_CORNER = 1, 29
-INKY_CORNER = 29, 29
-
-GHOST_HOUSE_LOCATION = 15, 14
-GHOST_HOUSE_EXIT = 14, 12
-
-POWER_UP_LIMIT = 10 * FPS
-
-# GHOST HOUSE BOUNDARIES TO KNOW WHEN A GHOST IS INSIDE THE HOUSE
-GHOST_HOUSE_COORDINATES_X = (11, 16)
-GHOST_HOUSE_COORDINATES_Y = (14, 16)
+# color of the screen behind the maze and the score line
+BACKGROUND_COLOR = (12, 2, 25)
+# Width and height of the tiles in pixels, the view then scrolls after pacman over mazes larger than the window.
+# None fits the whole maze in the window, e.g. (30, 28) with the default level
+VIEWPORT_TILE_SIZE = None
+# tiles on each side of the cached pieces the maze is drawn from
+MAZE_CHUNK_TILES = 8
+# pieces of each maze layer kept, the ones not shown for the longest time are drawn again when needed
+MAZE_CHUNK_CACHE = 128
+
+# Level played by the game, levels/level_loader.py describes the file format
+DEFAULT_LEVEL = 'assets/levels/default.level'
+# Directory where compiled levels are kept by hash of their file, None to parse level files on every load
+LEVEL_CACHE = '.cache/levels'
+
+# frightened ghosts blink during the last ticks of a power up
+POWER_UP_BLINK = 3 * FPS
+
+# Ghosts pick turns by shortest path through the maze instead of straight line distance to their target
+MAZE_NAVIGATION = False
+# bytes of distance fields of moving targets kept per level, a field takes 4 bytes per tile
+NAVIGATION_CACHE_BYTES = 32 * 1024 * 1024
+# boards up to this number of tiles get the fields of every target at level load
+NAVIGATION_ALL_PAIRS_TILES = 400
 
 # 5 seconds
 SCATTER_DISABLE_TRIGGER = FPS * 5
@@ -48,48 +73,13 @@ FAST_VELOCITY = 8
 # The greater number -> the slower animation
 PLAYER_SPRITE_FREQUENCY = 7
 GHOST_SPRITE_FREQUENCY = 10
+DEATH_ANIMATION_FRAMES = 12
 
-
-GHOST_EATEN_EVENT = pygame.USEREVENT + 1
-PLAYER_EATEN_EVENT = pygame.USEREVENT + 2
-
+# ticks the game stands still after pacman was caught
+PLAYER_EATEN_FREEZE = FPS // 2
 
 
-# 0 = empty black rectangle, 1 = dot, 2 = big dot, 3 = vertical line,
-# 4 = horizontal line, 5 = top right, 6 = top left, 7 = bot left, 8 = bot right
-# 9 = gate
-BOARD = np.array([
-[6, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 5],
-[3, 6, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 5, 6, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 5, 3],
-[3, 3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3, 3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3, 3],
-[3, 3, 1, 6, 4, 4, 5, 1, 6, 4, 4, 4, 5, 1, 3, 3, 1, 6, 4, 4, 4, 5, 1, 6, 4, 4, 5, 1, 3, 3],
-[3, 3, 2, 3, 0, 0, 3, 1, 3, 0, 0, 0, 3, 1, 3, 3, 1, 3, 0, 0, 0, 3, 1, 3, 0, 0, 3, 2, 3, 3],
-[3, 3, 1, 7, 4, 4, 8, 1, 7, 4, 4, 4, 8, 1, 7, 8, 1, 7, 4, 4, 4, 8, 1, 7, 4, 4, 8, 1, 3, 3],
-[3, 3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3, 3],
-[3, 3, 1, 6, 4, 4, 5, 1, 6, 5, 1, 6, 4, 4, 4, 4, 4, 4, 5, 1, 6, 5, 1, 6, 4, 4, 5, 1, 3, 3],
-[3, 3, 1, 7, 4, 4, 8, 1, 3, 3, 1, 7, 4, 4, 5, 6, 4, 4, 8, 1, 3, 3, 1, 7, 4, 4, 8, 1, 3, 3],
-[3, 3, 1, 1, 1, 1, 1, 1, 3, 3, 1, 1, 1, 1, 3, 3, 1, 1, 1, 1, 3, 3, 1, 1, 1, 1, 1, 1, 3, 3],
-[3, 7, 4, 4, 4, 4, 5, 1, 3, 7, 4, 4, 5, 0, 3, 3, 0, 6, 4, 4, 8, 3, 1, 6, 4, 4, 4, 4, 8, 3],
-[3, 0, 0, 0, 0, 0, 3, 1, 3, 6, 4, 4, 8, 0, 7, 8, 0, 7, 4, 4, 5, 3, 1, 3, 0, 0, 0, 0, 0, 3],
-[3, 0, 0, 0, 0, 0, 3, 1, 3, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3, 3, 1, 3, 0, 0, 0, 0, 0, 3],
-[8, 0, 0, 0, 0, 0, 3, 1, 3, 3, 0, 6, 4, 4, 9, 9, 4, 4, 5, 0, 3, 3, 1, 3, 0, 0, 0, 0, 0, 7],
-[4, 4, 4, 4, 4, 4, 8, 1, 7, 8, 0, 3, 0, 0, 0, 0, 0, 0, 3, 0, 7, 8, 1, 7, 4, 4, 4, 4, 4, 4],
-[0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 3, 0, 0, 0, 0, 0, 0, 3, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
-[4, 4, 4, 4, 4, 4, 5, 1, 6, 5, 0, 3, 0, 0, 0, 0, 0, 0, 3, 0, 6, 5, 1, 6, 4, 4, 4, 4, 4, 4],
-[5, 0, 0, 0, 0, 0, 3, 1, 3, 3, 0, 7, 4, 4, 4, 4, 4, 4, 8, 0, 3, 3, 1, 3, 0, 0, 0, 0, 0, 6],
-[3, 0, 0, 0, 0, 0, 3, 1, 3, 3, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3, 3, 1, 3, 0, 0, 0, 0, 0, 3],
-[3, 0, 0, 0, 0, 0, 3, 1, 3, 3, 0, 6, 4, 4, 4, 4, 4, 4, 5, 0, 3, 3, 1, 3, 0, 0, 0, 0, 0, 3],
-[3, 6, 4, 4, 4, 4, 8, 1, 7, 8, 0, 7, 4, 4, 5, 6, 4, 4, 8, 0, 7, 8, 1, 7, 4, 4, 4, 4, 5, 3],
-[3, 3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3, 3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3, 3],
-[3, 3, 1, 6, 4, 4, 5, 1, 6, 4, 4, 4, 5, 1, 3, 3, 1, 6, 4, 4, 4, 5, 1, 6, 4, 4, 5, 1, 3, 3],
-[3, 3, 1, 7, 4, 5, 3, 1, 7, 4, 4, 4, 8, 1, 7, 8, 1, 7, 4, 4, 4, 8, 1, 3, 6, 4, 8, 1, 3, 3],
-[3, 3, 2, 1, 1, 3, 3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3, 3, 1, 1, 2, 3, 3],
-[3, 7, 4, 5, 1, 3, 3, 1, 6, 5, 1, 6, 4, 4, 4, 4, 4, 4, 5, 1, 6, 5, 1, 3, 3, 1, 6, 4, 8, 3],
-[3, 6, 4, 8, 1, 7, 8, 1, 3, 3, 1, 7, 4, 4, 5, 6, 4, 4, 8, 1, 3, 3, 1, 7, 8, 1, 7, 4, 5, 3],
-[3, 3, 1, 1, 1, 1, 1, 1, 3, 3, 1, 1, 1, 1, 3, 3, 1, 1, 1, 1, 3, 3, 1, 1, 1, 1, 1, 1, 3, 3],
-[3, 3, 1, 6, 4, 4, 4, 4, 8, 7, 4, 4, 5, 1, 3, 3, 1, 6, 4, 4, 8, 7, 4, 4, 4, 4, 5, 1, 3, 3],
-[3, 3, 1, 7, 4, 4, 4, 4, 4, 4, 4, 4, 8, 1, 7, 8, 1, 7, 4, 4, 4, 4, 4, 4, 4, 4, 8, 1, 3, 3],
-[3, 3, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 3, 3],
-[3, 7, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 8, 3],
-[7, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 8]
-         ])
\ No newline at end of file
+# Mixer channels shared by all sound effects
+SOUND_CHANNELS = 8
+# Directory where decoded sound samples are kept between runs, None to decode the WAV files on every start
+SOUND_PCM_CACHE = None
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+
+import random
+import sys
+import time
+
+import numpy as np
+from numpy import ndarray
+
+from draw.viewport import get_tile_size
+from levels.default_level import create_default_level
+from levels.level_loader import GHOST_NAMES
+from model.board_definition import BoardDefinition, DOWN_EXIT, LEFT_EXIT, RIGHT_EXIT, UP_EXIT
+from model.board_structure import BoardStructure
+from model.direction import Direction
+from model.entity.ghost.ghost import Ghost
+from model.entity.ghost.targeting import GhostTargeting, TargetingSnapshot
+from model.entity.player.player import Player
+from model.level_config import LevelConfig
+from settings import *
+
+RIGHT, LEFT, UP, DOWN = Direction.RIGHT.value, Direction.LEFT.value, Direction.UP.value, Direction.DOWN.value
+# direction value -> opposite direction value and movement unit
+OPPOSITE = np.array([LEFT, RIGHT, DOWN, UP])
+DELTA_X = np.array([1, -1, 0, 0])
+DELTA_Y = np.array([0, 0, -1, 1])
+# turns a ghost considers for each current direction, in the order the scalar Ghost sorts them
+GHOST_CANDIDATES = np.array([[RIGHT, UP, DOWN], [LEFT, UP, DOWN], [RIGHT, LEFT, UP], [RIGHT, LEFT, DOWN]])
+
+PLAYER_READY, PLAYER_EATEN, PLAYER_CHASE = Player.State.READY.value, Player.State.EATEN.value, Player.State.CHASE.value
+GHOST_CHASE, GHOST_EATEN = Ghost.State.CHASE.value, Ghost.State.EATEN.value
+GHOST_FRIGHTENED, GHOST_SCATTER = Ghost.State.FRIGHTENED.value, Ghost.State.SCATTER.value
+
+# command value meaning "keep the last command", like GameEngine.step(None)
+NO_COMMAND = -1
+# due tick of a timer that is not scheduled
+NEVER = -1
+PLAYER_VELOCITY = 2
+
+
+class BatchEngine:
+    # Steps N games in lockstep. Every game follows the same rules as GameEngine with the
+    # default four ghosts, but the state of all games lives in NumPy arrays and each rule
+    # is applied to all games at once.
+
+    def __init__(self, games, level: LevelConfig = None, resolution=RESOLUTION):
+        level = level if level is not None else create_default_level()
+        board = level.board_definition.to_array()
+        self.games = games
+        self.index = np.arange(games)
+        self.height, self.width = board.shape
+        self.tile_width, self.tile_height = get_tile_size(level.board_definition, resolution)
+        self.initial_board = board.astype(np.int8)
+        self.initial_dots = level.board_definition.pellets.remaining
+        self.exits = np.asarray(level.board_definition.exits)
+        self.power_up_limit = level.power_up_limit
+
+        self.player_start = np.array(self.__to_tile_center(level.player_position))
+        self.ghost_start = np.array([self.__to_tile_center(level.ghost_positions[name]) for name in GHOST_NAMES])
+        self.ghost_corners = np.array([self.__to_ghost_target(level.ghost_corners[name]) for name in GHOST_NAMES])
+        self.ghost_house_location = np.array(self.__to_ghost_target(level.ghost_house_location))
+        self.ghost_house_exit = np.array(self.__to_ghost_target(level.ghost_house_exit))
+        self.ghost_house_bounds = level.ghost_house_bounds
+        self.targeting = GhostTargeting(GHOST_NAMES, self.ghost_corners, self.ghost_house_location,
+                                        self.ghost_house_exit, self.ghost_house_bounds, self.tile_width,
+                                        self.tile_height)
+
+        self.boards = np.empty((games, self.height, self.width), dtype=np.int8)
+        self.dots_left = np.empty(games, dtype=np.int32)
+        self.player_position = np.empty((games, 2), dtype=np.int32)
+        self.player_direction = np.empty(games, dtype=np.int8)
+        self.player_state = np.empty(games, dtype=np.int8)
+        self.player_turns = np.empty((games, 4), dtype=bool)
+        self.lives = np.empty(games, dtype=np.int8)
+        self.powerup = np.empty(games, dtype=bool)
+        self.score_multiplier = np.empty(games, dtype=np.int32)
+        self.death_sprite_counter = np.empty(games, dtype=np.int32)
+        self.death_sprite_index = np.empty(games, dtype=np.int32)
+        self.direction_command = np.empty(games, dtype=np.int8)
+        self.frozen = np.empty(games, dtype=bool)
+        self.ghost_mode = np.empty(games, dtype=np.int8)
+        # the timers of GameEngine.scheduler, as the tick of the game clock each one is due
+        self.clock = np.empty(games, dtype=np.int64)
+        self.start_due = np.empty(games, dtype=np.int64)
+        self.unfreeze_due = np.empty(games, dtype=np.int64)
+        self.mode_due = np.empty(games, dtype=np.int64)
+        self.power_up_due = np.empty(games, dtype=np.int64)
+        self.game_over = np.empty(games, dtype=bool)
+        self.score = np.empty(games, dtype=np.int64)
+        self.ticks = np.empty(games, dtype=np.int64)
+
+        self.ghost_position = np.empty((games, 4, 2), dtype=np.int32)
+        self.ghost_direction = np.empty((games, 4), dtype=np.int8)
+        self.ghost_state = np.empty((games, 4), dtype=np.int8)
+        self.ghost_velocity = np.empty((games, 4), dtype=np.int32)
+        # the scalar ghosts share one Turns instance, so a reversal uses whatever the last ghost computed
+        self.ghost_turns = np.empty((games, 4), dtype=bool)
+        self.reset()
+
+    def reset(self):
+        self.boards[:] = self.initial_board
+        self.dots_left[:] = self.initial_dots
+        self.player_position[:] = self.player_start
+        self.player_direction[:] = RIGHT
+        self.player_state[:] = PLAYER_READY
+        self.player_turns[:] = False
+        self.lives[:] = 3
+        self.powerup[:] = False
+        self.score_multiplier[:] = 1
+        self.death_sprite_counter[:] = 0
+        self.death_sprite_index[:] = 0
+        self.direction_command[:] = LEFT
+        self.frozen[:] = False
+        self.clock[:] = 0
+        self.start_due[:] = NEVER
+        self.unfreeze_due[:] = NEVER
+        self.game_over[:] = False
+        self.score[:] = 0
+        self.ticks[:] = 0
+        self.ghost_position[:] = self.ghost_start
+        self.ghost_direction[:] = UP
+        self.ghost_state[:] = GHOST_SCATTER
+        self.ghost_velocity[:] = DEFAULT_VELOCITY
+        self.ghost_turns[:] = False
+        self.__get_ready(np.ones(self.games, dtype=bool))
+
+    def observation(self) -> dict:
+        # Views on the live state, they are updated in place by every step
+        return {'boards': self.boards, 'player_position': self.player_position,
+                'player_direction': self.player_direction, 'player_state': self.player_state,
+                'ghost_position': self.ghost_position, 'ghost_direction': self.ghost_direction,
+                'ghost_state': self.ghost_state, 'lives': self.lives, 'score': self.score,
+                'powerup': self.powerup, 'game_over': self.game_over}
+
+    def step(self, direction_commands: ndarray = None):
+        # direction_commands holds a Direction value per game or NO_COMMAND to keep the previous one
+        if direction_commands is not None:
+            commands = np.asarray(direction_commands)
+            self.direction_command[:] = np.where(commands >= 0, commands, self.direction_command)
+
+        active = ~self.game_over
+        self.clock[active] += 1
+        self.__fire_timers(active)
+        finished = active & (self.lives == -1)
+        self.game_over |= finished
+        active &= ~finished & ~self.frozen
+        chasing = active & (self.player_state == PLAYER_CHASE)
+        eaten = active & (self.player_state == PLAYER_EATEN)
+        self.ticks[~self.game_over] += 1
+
+        player_start, ghost_start = self.player_position.copy(), self.ghost_position.copy()
+        self.__move_player(chasing)
+        self.__move_ghosts(chasing)
+        self.__check_collisions(chasing, player_start, ghost_start)
+        completed = chasing & (self.player_state == PLAYER_CHASE) & (self.dots_left == 0)
+        self.player_state[completed] = PLAYER_READY
+        self.player_position[completed] = self.player_start
+        self.player_direction[completed] = RIGHT
+        self.__get_ready(completed)
+        self.__update_death_animation(eaten)
+
+    def __fire_timers(self, mask):
+        # Timers firing on the same tick do not depend on each other, their order does not matter
+        started = mask & (self.start_due == self.clock)
+        self.player_state[started] = PLAYER_CHASE
+        self.mode_due[started] = self.clock[started] + SCATTER_ENABLE_TRIGGER
+
+        self.frozen[mask & (self.unfreeze_due == self.clock)] = False
+
+        switched = mask & (self.mode_due == self.clock)
+        self.ghost_mode[switched] = np.where(self.ghost_mode[switched] == GHOST_CHASE, GHOST_SCATTER, GHOST_CHASE)
+        self.mode_due[switched] = self.clock[switched] + np.where(self.ghost_mode[switched] == GHOST_SCATTER,
+                                                                  SCATTER_DISABLE_TRIGGER, SCATTER_ENABLE_TRIGGER)
+        for k in range(4):
+            self.__set_ghost_state_to_mode(k, switched & (self.ghost_state[:, k] != GHOST_FRIGHTENED))
+
+        self.__end_power_up(mask & (self.power_up_due == self.clock))
+
+    def __get_ready(self, mask):
+        # Same as GameEngine.__get_ready
+        refilled = mask & (self.dots_left == 0)
+        self.boards[refilled] = self.initial_board
+        self.dots_left[refilled] = self.initial_dots
+        self.__end_power_up(mask)
+        self.mode_due[mask] = NEVER
+        self.ghost_mode[mask] = GHOST_CHASE
+        for k in range(4):
+            self.__set_ghost_state(k, mask, GHOST_CHASE, force=True)
+            self.ghost_position[mask, k] = self.ghost_start[k]
+        self.start_due[mask] = self.clock[mask] + START_TRIGGER
+
+    def __end_power_up(self, mask):
+        self.powerup[mask] = False
+        self.score_multiplier[mask] = 1
+        self.power_up_due[mask] = NEVER
+        for k in range(4):
+            self.__set_ghost_state_to_mode(k, mask & (self.ghost_state[:, k] == GHOST_FRIGHTENED))
+
+    def __update_death_animation(self, mask):
+        self.death_sprite_counter[mask] += 1
+        self.death_sprite_index[mask & (self.death_sprite_counter % PLAYER_SPRITE_FREQUENCY == 0)] += 1
+        restart = (DEATH_ANIMATION_FRAMES - 1) * PLAYER_SPRITE_FREQUENCY
+        self.death_sprite_index[mask & (self.death_sprite_counter % restart == 0)] = 0
+        done = mask & (self.death_sprite_index == DEATH_ANIMATION_FRAMES - 2)
+        self.player_state[done] = PLAYER_READY
+        self.player_position[done] = self.player_start
+        self.player_direction[done] = RIGHT
+        self.death_sprite_index[done] = 0
+        self.lives[done] -= 1
+        self.__get_ready(done)
+
+    def __move_player(self, mask):
+        x, y = self.player_position[:, 0], self.player_position[:, 1]
+        self.__teleport_if_board_limit_reached(x, y, mask)
+        self.player_turns[mask] = self.__check_borders_ahead(x, y, BoardDefinition.Walker.PLAYER.value)[mask]
+        turned = self.__align_movement_to_cell_center(self.direction_command, self.player_direction,
+                                                      self.player_turns, x, y, mask)
+        self.__advance(x, y, self.player_direction, self.player_turns, PLAYER_VELOCITY, mask)
+        not_turned = mask & ~turned
+        self.direction_command[not_turned] = self.player_direction[not_turned]
+
+        i, j = self.__wrap_index(y // self.tile_height, self.height), self.__wrap_index(x // self.tile_width, self.width)
+        cell = self.boards[self.index, i, j]
+        dot = mask & (cell == BoardStructure.DOT.value)
+        big_dot = mask & (cell == BoardStructure.BIG_DOT.value)
+        eaten = dot | big_dot
+        self.boards[self.index[eaten], i[eaten], j[eaten]] = BoardStructure.EMPTY.value
+        self.dots_left[eaten] -= 1
+        self.score[dot] += 10
+        self.score[big_dot] += 50
+        self.powerup[big_dot] = True
+        self.power_up_due[big_dot] = self.clock[big_dot] + self.power_up_limit
+        for k in range(4):
+            self.__set_ghost_to_frightened(k, big_dot)
+
+    def __move_ghosts(self, mask):
+        # the targets of all ghosts are found before any of them moves, as GameEngine does
+        snapshot = TargetingSnapshot(self.player_position[:, 0:1], self.player_position[:, 1:2],
+                                     self.player_direction[:, None], self.ghost_position[:, :, 0],
+                                     self.ghost_position[:, :, 1], self.ghost_state)
+        target_x, target_y = self.targeting.evaluate(snapshot)
+        for k in range(4):
+            self.__follow_target(k, mask, target_x[:, k], target_y[:, k])
+
+    def __follow_target(self, k, mask, target_x, target_y):
+        x, y = self.ghost_position[:, k, 0], self.ghost_position[:, k, 1]
+        state = self.ghost_state[:, k]
+        eaten = state == GHOST_EATEN
+        walker = np.where(eaten, BoardDefinition.Walker.EATEN_GHOST.value, BoardDefinition.Walker.GHOST.value)
+        turns = self.__check_borders_ahead(x, y, walker)
+        self.ghost_turns[mask] = turns[mask]
+
+        self.__set_ghost_state(k, mask & eaten & self.targeting.is_in_house(x, y), GHOST_CHASE, force=True)
+
+        target_i, target_j = target_y // self.tile_height, target_x // self.tile_width
+        candidate_x = x[:, None] + DELTA_X[None, :] * self.tile_width
+        candidate_y = y[:, None] + DELTA_Y[None, :] * self.tile_height
+        distance = (target_j[:, None] - candidate_x // self.tile_width) ** 2 + \
+                   (target_i[:, None] - candidate_y // self.tile_height) ** 2
+
+        candidates = GHOST_CANDIDATES[self.ghost_direction[:, k]]
+        candidate_distance = np.take_along_axis(distance, candidates, axis=1)
+        candidate_allowed = np.take_along_axis(self.ghost_turns, candidates, axis=1)
+        # stable sort by distance, reversed when running away, then the first allowed turn
+        order = np.arange(3)[None, :]
+        runaway = (state == GHOST_FRIGHTENED)[:, None]
+        key = np.where(runaway, -candidate_distance, candidate_distance) * 4 + order
+        key = np.where(candidate_allowed, key, np.iinfo(np.int64).max)
+        best = np.argmin(key, axis=1)
+        next_turn = np.where(candidate_allowed.any(axis=1), candidates[self.index, best], NO_COMMAND)
+
+        self.__move_ghost(k, next_turn, mask)
+
+    def __check_collisions(self, mask, player_start, ghost_start):
+        player_start = self.__untangle_teleports(player_start, self.player_position)
+        for k in range(4):
+            state = self.ghost_state[:, k]
+            start = self.__untangle_teleports(ghost_start[:, k], self.ghost_position[:, k])
+            hit = mask & self.__sweeps_overlap(player_start, self.player_position, start, self.ghost_position[:, k])
+            frightened = hit & (state == GHOST_FRIGHTENED)
+            self.score[frightened] += 50 * self.score_multiplier[frightened]
+            self.score_multiplier[frightened] += 1
+            self.ghost_state[frightened, k] = GHOST_EATEN
+            self.ghost_velocity[frightened, k] = FAST_VELOCITY
+            caught = hit & ((state == GHOST_CHASE) | (state == GHOST_SCATTER)) & (self.player_state != PLAYER_EATEN)
+            self.frozen[caught] = True
+            self.unfreeze_due[caught] = self.clock[caught] + PLAYER_EATEN_FREEZE
+            self.player_state[caught] = PLAYER_EATEN
+
+    def __untangle_teleports(self, start, end):
+        # Same as CollisionGrid.move: an entity that teleported did not cross the tiles in between
+        teleported = (np.abs(end[:, 0] - start[:, 0]) > self.tile_width) | (np.abs(end[:, 1] - start[:, 1]) > self.tile_height)
+        return np.where(teleported[:, None], end, start)
+
+    @staticmethod
+    def __sweeps_overlap(first_start, first_end, second_start, second_end):
+        # Vectorized sweeps_overlap of model.collision.collision_grid
+        distance = (first_start - second_start).astype(float)
+        speed = ((first_end - first_start) - (second_end - second_start)).astype(float)
+        moving = speed != 0
+        safe_speed = np.where(moving, speed, 1)
+        bounds = np.stack([(-DISTANCE_FACTOR - distance) / safe_speed, (DISTANCE_FACTOR - distance) / safe_speed])
+        low = np.where(moving, bounds.min(axis=0), -np.inf)
+        high = np.where(moving, bounds.max(axis=0), np.inf)
+        still_apart = ~moving & (np.abs(distance) >= DISTANCE_FACTOR)
+        earliest, latest = low.max(axis=1), high.min(axis=1)
+        return ~still_apart.any(axis=1) & (earliest < latest) & (earliest < 1) & (latest > 0)
+
+    def __set_ghost_state(self, k, mask, state, force=False):
+        # like Ghost.set_to_chase/set_to_scatter, which leave eaten ghosts alone unless forced
+        if not force:
+            mask = mask & (self.ghost_state[:, k] != GHOST_EATEN)
+        self.ghost_state[mask, k] = state
+        self.ghost_velocity[mask, k] = DEFAULT_VELOCITY
+
+    def __set_ghost_state_to_mode(self, k, mask):
+        for mode in (GHOST_CHASE, GHOST_SCATTER):
+            self.__set_ghost_state(k, mask & (self.ghost_mode == mode), mode)
+
+    def __set_ghost_to_frightened(self, k, mask):
+        mask = mask & (self.ghost_state[:, k] != GHOST_EATEN)
+        self.__move_ghost(k, OPPOSITE[self.ghost_direction[:, k]], mask)
+        self.ghost_velocity[mask, k] = SLOW_VELOCITY
+        self.ghost_state[mask, k] = GHOST_FRIGHTENED
+
+    def __move_ghost(self, k, direction_command, mask):
+        x, y = self.ghost_position[:, k, 0], self.ghost_position[:, k, 1]
+        direction = self.ghost_direction[:, k]
+        self.__teleport_if_board_limit_reached(x, y, mask)
+        self.__align_movement_to_cell_center(direction_command, direction, self.ghost_turns, x, y, mask)
+        self.__advance(x, y, direction, self.ghost_turns, self.ghost_velocity[:, k], mask)
+
+    def __check_borders_ahead(self, x, y, walker):
+        # Same lookups as Entity._update_turns, walker is a BoardDefinition.Walker value per game
+        i = y // self.tile_height
+        j = x // self.tile_width
+        turns = np.empty((self.games, 4), dtype=bool)
+        turns[:, LEFT] = self.exits[walker, i, (x + DISTANCE_FACTOR) // self.tile_width] & LEFT_EXIT
+        turns[:, RIGHT] = self.exits[walker, i, (x - DISTANCE_FACTOR) // self.tile_width] & RIGHT_EXIT
+        turns[:, UP] = self.exits[walker, (y + DISTANCE_FACTOR) // self.tile_height, j] & UP_EXIT
+        turns[:, DOWN] = self.exits[walker, (y - DISTANCE_FACTOR) // self.tile_height, j] & DOWN_EXIT
+        return turns
+
+    @staticmethod
+    def __wrap_index(index, size):
+        return np.where(index < 0, index + size, index)
+
+    def __align_movement_to_cell_center(self, direction_command, direction, turns, x, y, mask):
+        valid = mask & (direction_command >= 0)
+        command = np.where(valid, direction_command, 0)
+        allowed = valid & turns[self.index, command]
+        at_center = ((x - self.tile_width // 2) % self.tile_width < 2) & \
+                    ((y - self.tile_height // 2) % self.tile_height < 2)
+        change = allowed & ((direction == OPPOSITE[command]) | at_center)
+        direction[change] = command[change]
+        return allowed
+
+    def __advance(self, x, y, direction, turns, velocity, mask):
+        can_move = turns[self.index, direction]
+        moving = mask & can_move
+        snapping = mask & ~can_move
+        x += np.where(moving, DELTA_X[direction] * velocity, 0).astype(x.dtype)
+        y += np.where(moving, DELTA_Y[direction] * velocity, 0).astype(y.dtype)
+        x[snapping] = (x[snapping] // self.tile_width) * self.tile_width + self.tile_width // 2
+        y[snapping] = (y[snapping] // self.tile_height) * self.tile_height + self.tile_height // 2
+
+    def __teleport_if_board_limit_reached(self, x, y, mask):
+        half_width, half_height = SPRITE_SIZE[0] // 2, SPRITE_SIZE[1] // 2
+        top_left_x, top_left_y = x - half_width, y - half_height
+        left_j, right_j = top_left_x // self.tile_width, (top_left_x + SPRITE_SIZE[1]) // self.tile_width
+        left_i, right_i = top_left_y // self.tile_height, (top_left_y + SPRITE_SIZE[0]) // self.tile_height
+        top_left_x = np.where(mask & (left_j >= self.width - 1), self.tile_width, top_left_x)
+        top_left_x = np.where(mask & (right_j < 1), (self.width - 1) * self.tile_width, top_left_x)
+        top_left_y = np.where(mask & (left_i >= self.height - 1), self.tile_height, top_left_y)
+        top_left_y = np.where(mask & (right_i < 1), (self.height - 1) * self.tile_height, top_left_y)
+        x[:] = top_left_x + half_width
+        y[:] = top_left_y + half_height
+
+    def __to_tile_center(self, tile):
+        return tile[0] * self.tile_width + self.tile_width // 2, tile[1] * self.tile_height + self.tile_height // 2
+
+    def __to_ghost_target(self, tile):
+        # same conversion as Ghost does for its corners and house coordinates
+        return tile[0] * self.tile_width - self.tile_width // 2, tile[1] * self.tile_height + self.tile_height // 2
+
+
+def check_parity(games=8, ticks=3000, seed=0):
+    # Steps scalar GameEngines and a BatchEngine with the same random commands and
+    # returns the first (tick, game, field) that differs, or None
+    from simulation.headless import create_headless_engine
+
+    rng = random.Random(seed)
+    engines = [create_headless_engine() for _ in range(games)]
+    batch = BatchEngine(games)
+    for tick in range(ticks):
+        commands = np.array([rng.choice(list(Direction)).value if rng.random() < 0.05 else NO_COMMAND
+                             for _ in range(games)])
+        batch.step(commands)
+        for n, engine in enumerate(engines):
+            engine.step(Direction(commands[n]) if commands[n] != NO_COMMAND else None)
+            mismatch = _compare(engine, batch, n)
+            if mismatch is not None:
+                return tick, n, mismatch
+    return None
+
+
+def _compare(engine, batch: BatchEngine, n):
+    player = engine.player
+    expected = {
+        'game_over': (engine.game_over, batch.game_over[n]),
+        'score': (engine.level.score, batch.score[n]),
+        'lives': (player.lives, batch.lives[n]),
+        'player_state': (player.state.value, batch.player_state[n]),
+        'powerup': (player.powerup, batch.powerup[n]),
+        'player_position': ((player.location_x, player.location_y), tuple(batch.player_position[n])),
+        'player_direction': (player.direction.value, batch.player_direction[n]),
+        'ghost_position': ([(ghost.location_x, ghost.location_y) for ghost in engine.ghosts],
+                           [tuple(position) for position in batch.ghost_position[n]]),
+        'ghost_state': ([ghost.state.value for ghost in engine.ghosts], list(batch.ghost_state[n])),
+        'ghost_direction': ([ghost.direction.value for ghost in engine.ghosts], list(batch.ghost_direction[n])),
+        'board': (engine.board_definition.to_array().tobytes(), batch.boards[n].astype(np.uint8).tobytes()),
+    }
+    for field, (scalar, vectorized) in expected.items():
+        if scalar != vectorized:
+            return field
+    return None
+
+
+if __name__ == '__main__':
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    parity = check_parity()
+    print('parity with GameEngine: ' + ('ok' if parity is None else f'mismatch at tick/game/field {parity}'))
+    engine = BatchEngine(batch_size)
+    generator = np.random.default_rng(0)
+    start = time.perf_counter()
+    steps = 1000
+    for _ in range(steps):
+        engine.step(np.where(generator.random(batch_size) < 0.05, generator.integers(0, 4, batch_size), NO_COMMAND))
+    elapsed = time.perf_counter() - start
+    print(f'{batch_size} games x {steps} ticks in {elapsed:.3f}s ({batch_size * steps / elapsed:.0f} game ticks/s)')
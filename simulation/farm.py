@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from levels.default_level import create_default_level
+from levels.level_loader import load_level
+from simulation.headless import create_headless_engine
+from simulation.policies import POLICIES
+
+# named levels, any other level is the path of a level file
+LEVELS = {
+    'default': create_default_level,
+}
+
+# games simulated by a worker before its results are sent back to the parent process
+FARM_BATCH_SIZE = 64
+FARM_MAX_TICKS = 20000
+
+RESULT_DTYPE = np.dtype([
+    ('seed', np.int64),
+    ('score', np.int32),
+    ('ticks', np.int32),
+    ('deaths', np.int16),
+    ('dots_left', np.int16),
+])
+
+
+def create_level(level_name):
+    # Workers get the name or path of the level, a level file is compiled once and then shared by their games
+    if level_name in LEVELS:
+        return LEVELS[level_name]()
+    return load_level(level_name)
+
+
+def run_game(level_name, policy_name, seed, max_ticks=FARM_MAX_TICKS):
+    # Plays one seeded game until game over or max_ticks and returns its row of results
+    engine = create_headless_engine(create_level(level_name))
+    policy = POLICIES[policy_name](seed)
+    initial_lives = engine.player.lives
+    tick = 0
+    while tick < max_ticks and not engine.game_over:
+        engine.step(policy(engine, tick))
+        tick += 1
+    return seed, engine.level.score, tick, initial_lives - engine.player.lives, engine.pellets.remaining
+
+
+def _run_batch(job):
+    level_name, policy_name, seeds, max_ticks = job
+    return np.array([run_game(level_name, policy_name, seed, max_ticks) for seed in seeds], dtype=RESULT_DTYPE)
+
+
+def run_farm(games, level_name='default', policy_name='random', first_seed=0, max_ticks=FARM_MAX_TICKS,
+             workers=None, batch_size=FARM_BATCH_SIZE):
+    # Spreads games with seeds first_seed, first_seed + 1, ... over a process pool
+    seeds = range(first_seed, first_seed + games)
+    jobs = [(level_name, policy_name, seeds[start:start + batch_size], max_ticks)
+            for start in range(0, games, batch_size)]
+    results = np.empty(games, dtype=RESULT_DTYPE)
+    filled = 0
+    with Pool(workers or os.cpu_count()) as pool:
+        for batch in pool.imap_unordered(_run_batch, jobs):
+            results[filled:filled + len(batch)] = batch
+            filled += len(batch)
+    results.sort(order='seed')
+    return results
+
+
+def summarize(results) -> dict:
+    summary = {'games': len(results)}
+    for field in RESULT_DTYPE.names[1:]:
+        values = results[field]
+        summary[field] = {
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            'min': int(values.min()),
+            'median': float(np.median(values)),
+            'max': int(values.max()),
+        }
+    return summary
+
+
+def save_results(path, results, summary: dict, level_name, policy_name, max_ticks):
+    # A single compressed file holding every game row plus the run parameters and its summary as JSON
+    info = {'level': level_name, 'policy': policy_name, 'max_ticks': max_ticks, 'summary': summary}
+    np.savez_compressed(path, results=results, info=np.array(json.dumps(info)))
+
+
+def load_results(path):
+    with np.load(path) as data:
+        return data['results'], json.loads(str(data['info']))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run seeded headless games on all cores')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--level', default='default', help=f'{", ".join(LEVELS)} or the path of a .level file')
+    parser.add_argument('--policy', choices=POLICIES, default='random')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game')
+    parser.add_argument('--max-ticks', type=int, default=FARM_MAX_TICKS)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=FARM_BATCH_SIZE)
+    parser.add_argument('--output', default='farm_results.npz')
+    args = parser.parse_args()
+    try:
+        # a level file that cannot be read fails here rather than in every worker
+        create_level(args.level)
+    except (OSError, ValueError) as error:
+        parser.error(f'level {args.level}: {error}')
+
+    start = time.perf_counter()
+    farm_results = run_farm(args.games, args.level, args.policy, args.seed, args.max_ticks, args.workers,
+                            args.batch_size)
+    elapsed = time.perf_counter() - start
+    farm_summary = summarize(farm_results)
+    save_results(args.output, farm_results, farm_summary, args.level, args.policy, args.max_ticks)
+
+    total_ticks = int(farm_results['ticks'].sum())
+    print(f'{args.games} games, {total_ticks} ticks in {elapsed:.2f}s ({total_ticks / elapsed:.0f} ticks/s), '
+          f'written to {args.output}')
+    for name in RESULT_DTYPE.names[1:]:
+        stats = farm_summary[name]
+        print(f'{name:>10}: mean {stats["mean"]:.1f} std {stats["std"]:.1f} '
+              f'min {stats["min"]} median {stats["median"]:.1f} max {stats["max"]}')
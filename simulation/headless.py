@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+
+from draw.game_engine import GameEngine
+from levels.default_level import create_default_level
+from levels.level_content_initializer import LevelContentInitializer
+from model.level_config import LevelConfig
+from simulation.policies import RandomPolicy
+
+
+def create_headless_engine(level: LevelConfig = None) -> GameEngine:
+    # Builds a game that can be stepped without display and audio devices
+    return LevelContentInitializer(level if level is not None else create_default_level()).init_game_engine()
+
+
+def run_random_game(ticks, seed=0):
+    engine = create_headless_engine()
+    policy = RandomPolicy(seed)
+    for tick in range(ticks):
+        if engine.game_over:
+            return engine, tick
+        engine.step(policy(engine, tick))
+    return engine, ticks
+
+
+if __name__ == '__main__':
+    requested_ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    start = time.perf_counter()
+    game, played_ticks = run_random_game(requested_ticks)
+    elapsed = time.perf_counter() - start
+    print(f'{played_ticks} ticks in {elapsed:.3f}s ({played_ticks / elapsed:.0f} ticks/s), '
+          f'score {game.level.score}, lives {game.player.lives}')
@@ -0,0 +1,36 @@
+import random
+
+from draw.game_engine import GameEngine
+from model.direction import Direction
+
+# ticks between two direction changes of the random policy
+RANDOM_POLICY_PERIOD = 30
+
+
+class RandomPolicy:
+    # Picks a random direction every RANDOM_POLICY_PERIOD ticks
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def __call__(self, engine: GameEngine, tick):
+        if tick % RANDOM_POLICY_PERIOD == 0:
+            return self.rng.choice(list(Direction))
+        return None
+
+
+class RandomTurnsPolicy:
+    # Asks for a random turn with a small probability on every tick
+    def __init__(self, seed, probability=0.05):
+        self.rng = random.Random(seed)
+        self.probability = probability
+
+    def __call__(self, engine: GameEngine, tick):
+        if self.rng.random() < self.probability:
+            return self.rng.choice(list(Direction))
+        return None
+
+
+POLICIES = {
+    'random': RandomPolicy,
+    'random_turns': RandomTurnsPolicy,
+}
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+
+import argparse
+import base64
+import bisect
+import enum
+import json
+import time
+import zlib
+from pathlib import Path
+
+import settings
+from draw.game_engine import GameEngine
+from levels.level_loader import create_level, format_level, parse_level
+from model.board_definition import BoardDefinition
+from model.direction import Direction
+from model.entity.ghost.ghost import Ghost
+from model.entity.player.player import Player
+from model.level_config import LevelConfig
+from simulation.headless import create_headless_engine
+
+# A recording file starts with a line holding the magic and the format version, followed by a zlib compressed JSON
+# document. Game states are stored with tagged values (tuples, bytes, enums), nothing but these types is decoded.
+# A new version is needed whenever the same inputs would play differently, older recordings are refused:
+# 1: a pickle, 2: JSON, 3: the ghosts target from the state of the game before any of them moves
+REPLAY_MAGIC = b'PACREC'
+REPLAY_VERSION = 3
+# enums a game state may hold, by name
+STATE_ENUMS = {cls.__qualname__: cls for cls in (Direction, Ghost.State, Player.State, GameEngine.Timer,
+                                                 BoardDefinition.Walker)}
+# settings a recording is only valid with, they are stored with it and checked on replay
+REPLAY_SETTINGS = ('FPS', 'RESOLUTION', 'VIEWPORT_TILE_SIZE', 'DISTANCE_FACTOR', 'MAZE_NAVIGATION', 'DEFAULT_VELOCITY', 'SLOW_VELOCITY',
+                   'FAST_VELOCITY', 'START_TRIGGER', 'SCATTER_ENABLE_TRIGGER', 'SCATTER_DISABLE_TRIGGER',
+                   'PLAYER_EATEN_FREEZE', 'DEATH_ANIMATION_FRAMES', 'PLAYER_SPRITE_FREQUENCY')
+# bits of a recorded tick: the direction command in the low bits, then the pause flag
+DIRECTION_MASK = 0b11
+PAUSE_BIT = 0b100
+# parts of a game state, see GameEngine.save_state()
+STATE_SECTIONS = {'engine', 'score', 'pellets', 'player', 'player_turns', 'ghosts', 'ghost_turns', 'scheduler'}
+
+
+class Recording:
+    # Input of every logic tick of a game, with the level, the settings it was played with
+    # and keyframes of the game state to seek without simulating from the start
+
+    def __init__(self, level: str, game_settings: dict, inputs=None, keyframes=None):
+        # level file of the level played
+        self.level = level
+        self.settings = game_settings
+        self.inputs = bytearray(inputs or b'')
+        # tick -> GameEngine.save_state() before the tick was played
+        self.keyframes = keyframes or {}
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = {'level': self.level, 'settings': _encode(self.settings),
+                   'inputs': base64.b64encode(self.inputs).decode(),
+                   'keyframes': [[tick, _encode(state)] for tick, state in sorted(self.keyframes.items())]}
+        header = REPLAY_MAGIC + b'%d\n' % REPLAY_VERSION
+        path.write_bytes(header + zlib.compress(json.dumps(content, separators=(',', ':')).encode(), 9))
+
+    @classmethod
+    def load(cls, path):
+        data = Path(path).read_bytes()
+        magic, _, payload = data.partition(b'\n')
+        if not magic.startswith(REPLAY_MAGIC) or not magic[len(REPLAY_MAGIC):].isdigit():
+            raise ValueError(f'{path} is not a recording')
+        version = int(magic[len(REPLAY_MAGIC):])
+        if version < REPLAY_VERSION:
+            raise ValueError(f'{path} was recorded with older game rules (format {version}), it would not play back '
+                             f'the same with format {REPLAY_VERSION}')
+        if version != REPLAY_VERSION:
+            raise ValueError(f'{path} is a recording of format {version}, only format {REPLAY_VERSION} can be '
+                             f'replayed by this version of the game')
+        try:
+            content = json.loads(zlib.decompress(payload))
+            level, recorded_settings = content['level'], _decode(content['settings'])
+            inputs = base64.b64decode(content['inputs'], validate=True)
+            keyframes = {tick: _decode(state) for tick, state in content['keyframes']}
+        except (zlib.error, ValueError, KeyError, TypeError) as error:
+            raise ValueError(f'{path} is a damaged recording: {error}') from None
+        if not isinstance(level, str) or not isinstance(recorded_settings, dict) \
+                or set(recorded_settings) - set(REPLAY_SETTINGS):
+            raise ValueError(f'{path} is a damaged recording: unexpected level or settings')
+        if any(value > DIRECTION_MASK | PAUSE_BIT for value in inputs):
+            raise ValueError(f'{path} is a damaged recording: unexpected input values')
+        if any(not isinstance(tick, int) or not 0 <= tick <= len(inputs) or not isinstance(state, dict)
+               or set(state) != STATE_SECTIONS for tick, state in keyframes.items()):
+            raise ValueError(f'{path} is a damaged recording: unexpected keyframes')
+        return cls(level, recorded_settings, inputs, keyframes)
+
+    def create_level(self) -> LevelConfig:
+        return create_level(parse_level(self.level, 'recording'))
+
+    def get_settings_mismatches(self):
+        return [name for name, value in self.settings.items() if getattr(settings, name, None) != value]
+
+    def check_keyframes(self, engine: GameEngine):
+        # Keyframes are loaded back into engine attribute by attribute: they must hold the attributes the engine
+        # saves now, with values of the same types, or the recording was made by another version of the game
+        expected = _describe(engine.save_state())
+        for tick, state in self.keyframes.items():
+            if _describe(state) != expected:
+                raise ValueError(f'the keyframe of tick {tick} does not match the game state of this version')
+
+
+class InputRecorder:
+    # Call record() right before every GameEngine.step() of the game being recorded
+
+    def __init__(self, engine: GameEngine, keyframe_interval=settings.REPLAY_KEYFRAME_INTERVAL):
+        self.recording = Recording(format_level(engine.level),
+                                   {name: getattr(settings, name) for name in REPLAY_SETTINGS})
+        self.keyframe_interval = keyframe_interval
+
+    def record(self, engine: GameEngine):
+        tick = len(self.recording.inputs)
+        if tick % self.keyframe_interval == 0:
+            self.recording.keyframes[tick] = engine.save_state()
+        self.recording.inputs.append(engine.direction_command.value | (PAUSE_BIT if engine.pause else 0))
+
+
+class ReplayPlayer:
+    # Plays a recording back on a headless engine, tick by tick or as fast as possible
+
+    def __init__(self, recording: Recording, engine: GameEngine = None):
+        self.recording = recording
+        self.engine = engine if engine is not None else create_headless_engine(recording.create_level())
+        recording.check_keyframes(self.engine)
+        self.keyframe_ticks = sorted(recording.keyframes)
+        self.tick = 0
+
+    def is_finished(self):
+        return self.tick >= len(self.recording.inputs)
+
+    def step(self):
+        value = self.recording.inputs[self.tick]
+        self.engine.pause = bool(value & PAUSE_BIT)
+        self.engine.step(Direction(value & DIRECTION_MASK))
+        self.tick += 1
+
+    def run(self, ticks=None):
+        end = len(self.recording.inputs) if ticks is None else min(self.tick + ticks, len(self.recording.inputs))
+        while self.tick < end:
+            self.step()
+
+    def seek(self, tick):
+        # Restores the closest keyframe before tick, when going back or when it saves ticks, and plays the rest
+        tick = min(max(tick, 0), len(self.recording.inputs))
+        position = bisect.bisect_right(self.keyframe_ticks, tick) - 1
+        if position >= 0 and (tick < self.tick or self.keyframe_ticks[position] > self.tick):
+            self.tick = self.keyframe_ticks[position]
+            self.engine.load_state(self.recording.keyframes[self.tick])
+        elif tick < self.tick:
+            raise ValueError(f'no keyframe to go back to tick {tick}')
+        self.run(tick - self.tick)
+
+
+def _encode(value):
+    # JSON value of a game state or of the settings, types JSON has no equivalent for are tagged
+    if isinstance(value, enum.Enum):
+        return {'enum': type(value).__qualname__, 'value': value.value}
+    if isinstance(value, bytes):
+        return {'bytes': base64.b64encode(value).decode()}
+    if isinstance(value, tuple):
+        return {'tuple': [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {'dict': {key: _encode(item) for key, item in value.items()}}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f'{type(value).__name__} values cannot be recorded')
+
+
+def _decode(value):
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if set(value) == {'enum', 'value'} and value['enum'] in STATE_ENUMS:
+        return STATE_ENUMS[value['enum']](value['value'])
+    if set(value) == {'bytes'}:
+        return base64.b64decode(value['bytes'], validate=True)
+    if set(value) == {'tuple'} and isinstance(value['tuple'], list):
+        return tuple(_decode(item) for item in value['tuple'])
+    if set(value) == {'dict'} and isinstance(value['dict'], dict):
+        return {key: _decode(item) for key, item in value['dict'].items()}
+    raise ValueError(f'unexpected value {str(value)[:80]}')
+
+
+def _describe(state):
+    # The attribute names and value types of a game state, the pending timers and the pellet bits aside
+    sections = {}
+    for name in ('engine', 'player', 'player_turns'):
+        sections[name] = {key: type(value) for key, value in state[name].items()}
+    for name in ('ghosts', 'ghost_turns'):
+        sections[name] = [{key: type(value) for key, value in values.items()} for values in state[name]]
+    return sections
+
+
+def watch(recording: Recording, start_tick=0):
+    # Replays in real time in a window, with the renderer of the game
+    import pygame
+    from draw.game_renderer import GameRenderer
+    from levels.level_content_initializer import LevelContentInitializer
+
+    pygame.init()
+    screen = pygame.display.set_mode(settings.RESOLUTION)
+    engine = LevelContentInitializer(recording.create_level(), screen).init_game_engine()
+    player = ReplayPlayer(recording, engine)
+    player.seek(start_tick)
+    # the renderer draws the dots left on the board at the seeked tick
+    renderer = GameRenderer(screen, engine)
+    timer = pygame.time.Clock()
+    while not player.is_finished():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return
+        timer.tick(settings.FPS)
+        player.step()
+        if not renderer.is_static():
+            screen.fill(settings.BACKGROUND_COLOR)
+        renderer.render()
+        pygame.display.flip()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay a recorded game')
+    parser.add_argument('recording')
+    parser.add_argument('--seek', type=int, default=0, help='tick to start from')
+    parser.add_argument('--watch', action='store_true', help='replay in real time in a window')
+    args = parser.parse_args()
+
+    try:
+        loaded = Recording.load(args.recording)
+    except ValueError as error:
+        parser.exit(1, f'{error}\n')
+    mismatches = loaded.get_settings_mismatches()
+    if mismatches:
+        print(f'warning: recorded with other values of {", ".join(mismatches)}, the replay may differ')
+    if args.watch:
+        watch(loaded, args.seek)
+    else:
+        replay = ReplayPlayer(loaded)
+        start = time.perf_counter()
+        replay.seek(args.seek)
+        replay.run()
+        elapsed = time.perf_counter() - start
+        game = replay.engine
+        print(f'{replay.tick} ticks in {elapsed:.3f}s, score {game.level.score}, lives {game.player.lives}, '
+              f'game over {game.game_over}')